@@ -8,44 +8,81 @@ and extracts 16x16 pixel tile images from the existing tilesets.
 The script:
 1. Creates a "tiles" table with x, y coordinates, map_id, and tile_image_id
 2. Extracts 16x16 pixel tile images from the existing tilesets
+3. Writes each unique tile image to its own PNG file (and optionally packs
+   them all into a single atlas PNG)
 
 Usage:
-    python create_zones_and_tiles.py
+    python create_zones_and_tiles.py              # Build tables and write one PNG per tile image
+    python create_zones_and_tiles.py --atlas      # Also write the atlas PNG
+    python create_zones_and_tiles.py --skip-pngs  # Only build the database tables
 """
 
 import os
 import sqlite3
 import binascii
+import numpy as np
 from PIL import Image
 from pathlib import Path
 import sys
 import time
-import hashlib
-import io
 import re
+import argparse
+import hashlib
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the root directory to the Python path to allow imports from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.sqlite_utils import configure_bulk_load, finish_bulk_load
 
 # Constants
 # Get the project root directory (parent of the script's directory)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DB_PATH = PROJECT_ROOT / "pokemon.db"
 TILE_IMAGES_DIR = "tile_images"
+TILE_ATLAS_PATH = f"{TILE_IMAGES_DIR}/atlas.png"
+ATLAS_COLUMNS = 64  # Tile images per atlas row (1024 pixels wide)
 BATCH_SIZE = 1000  # Number of tiles to insert in a single batch
+PNG_COMPRESS_LEVEL = 1  # zlib level for tile PNGs; tiny images gain little from more
+
+# GameBoy color palette (white, light gray, dark gray, black), indexed by pixel value
+PALETTE = np.array(
+    [(255, 255, 255), (192, 192, 192), (96, 96, 96), (0, 0, 0)], dtype=np.uint8
+)
+
+# Tile offsets within a block for positions 0-3 (top-left, top-right,
+# bottom-left, bottom-right)
+POSITION_DX = np.array([0, 1, 0, 1], dtype=np.int64)
+POSITION_DY = np.array([0, 0, 1, 1], dtype=np.int64)
+
+# Indexes into a block's 16 tile indices (a row-major 4x4 grid) of the 2x2
+# tiles at positions 0-3, each in row-major order
+POSITION_TILE_OFFSETS = np.array(
+    [[0, 1, 4, 5], [2, 3, 6, 7], [8, 9, 12, 13], [10, 11, 14, 15]], dtype=np.int64
+)
 
 
 def create_new_tables():
     """Create new tiles and tile_images tables in the database"""
-    conn = sqlite3.connect(DB_PATH)
+    # Use autocommit mode so each load phase controls its own transaction with
+    # explicit BEGIN/COMMIT, and cache the prepared statements reused per batch
+    conn = sqlite3.connect(DB_PATH, isolation_level=None, cached_statements=512)
     cursor = conn.cursor()
 
+    # Tune SQLite for bulk loading
+    configure_bulk_load(cursor)
+    # Memory-map the database file so blob reads skip the pager copy
+    cursor.execute("PRAGMA mmap_size=268435456")
+
     # Drop existing tables if they exist
     cursor.execute("DROP TABLE IF EXISTS tiles")
     cursor.execute("DROP TABLE IF EXISTS tile_images")
 
-    # Create tiles table
+    # Create tiles table, clustered by map and local coordinates (global x, y
+    # are shifted later by update_zone_coordinates.py, local_x/local_y are not)
     cursor.execute(
         """
     CREATE TABLE IF NOT EXISTS tiles (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
         x INTEGER NOT NULL,
         y INTEGER NOT NULL,
         local_x INTEGER NOT NULL,
@@ -53,13 +90,14 @@ def create_new_tables():
         map_id INTEGER NOT NULL,
         tile_image_id INTEGER NOT NULL,
         is_overworld INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (map_id, local_x, local_y),
         FOREIGN KEY (map_id) REFERENCES maps (id),
         FOREIGN KEY (tile_image_id) REFERENCES tile_images (id)
-    )
+    ) WITHOUT ROWID
     """
     )
 
-    # Create tile_images table with image_hash for deduplication
+    # Create tile_images table; the UNIQUE tile_data column deduplicates images
     cursor.execute(
         """
     CREATE TABLE IF NOT EXISTS tile_images (
@@ -68,85 +106,105 @@ def create_new_tables():
         block_index INTEGER NOT NULL,
         position INTEGER NOT NULL,  -- 0: top-left, 1: top-right, 2: bottom-left, 3: bottom-right
         image_path TEXT NOT NULL,
-        image_hash TEXT NOT NULL,
+        atlas_row INTEGER NOT NULL,  -- 16x16 cell of this image in the atlas PNG (--atlas)
+        atlas_col INTEGER NOT NULL,
+        tile_data BLOB NOT NULL UNIQUE,  -- 16x16 palette indices (0-3), row-major
         FOREIGN KEY (tileset_id) REFERENCES tilesets (id)
     )
     """
     )
 
-    # Create indexes for better performance
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tiles_map_id ON tiles (map_id)")
-    cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_tiles_tile_image_id ON tiles (tile_image_id)"
-    )
+    # Create indexes for better performance (tiles indexes are built by
+    # create_tile_indexes once the table has been populated)
     cursor.execute(
         "CREATE INDEX IF NOT EXISTS idx_tile_images_tileset_id ON tile_images (tileset_id)"
     )
+
+    return conn
+
+
+def create_tile_indexes(conn):
+    """Create indexes on the tiles table after it has been bulk loaded
+
+    Lookups by map_id are served by the primary key.
+    """
+    cursor = conn.cursor()
+
     cursor.execute(
-        "CREATE INDEX IF NOT EXISTS idx_tile_images_hash ON tile_images (image_hash)"
+        "CREATE INDEX IF NOT EXISTS idx_tiles_tile_image_id ON tiles (tile_image_id)"
     )
 
-    conn.commit()
-    return conn
+
+def save_tile_image(canvas, image_path):
+    """Render a palette-index canvas to RGB and save it as a PNG file"""
+    Image.fromarray(PALETTE[canvas], "RGB").save(
+        image_path, optimize=False, compress_level=PNG_COMPRESS_LEVEL
+    )
 
 
-def decode_2bpp_tile(tile_data):
-    """Decode a 2bpp tile into a 2D array of pixel values (0-3)
+def block_position_tiles(blocks):
+    """Get the tile indexes of every 16x16 position of the blocks
 
-    Each tile is 8x8 pixels, with 2 bits per pixel.
-    Pixels are spread across neighboring bytes.
+    Each block is a 4x4 grid of tile indices, split into 4 positions of 2x2
+    tiles (top-left, top-right, bottom-left, bottom-right). Returns an array of
+    shape (len(blocks) * 4, 4) holding the four tile indexes of each position
+    in row-major order. Tiles missing from a short block get index 256.
     """
-    pixels = []
+    block_tiles = np.full((len(blocks), 16), 256, dtype=np.int64)
+    for row, block_data in enumerate(blocks):
+        tile_indexes = np.frombuffer(block_data, dtype=np.uint8)[:16]
+        block_tiles[row, : len(tile_indexes)] = tile_indexes
 
-    # Process 16 bytes (8 rows of 2 bytes each)
-    for row in range(8):
-        row_pixels = []
-        # Each row is represented by 2 bytes
-        byte1 = tile_data[row * 2]
-        byte2 = tile_data[row * 2 + 1]
+    # Gather the (block, position, tile) indexes in one fancy-indexing step
+    return block_tiles[:, POSITION_TILE_OFFSETS].reshape(-1, 4)
 
-        # Process each bit in the bytes
-        for bit in range(8):
-            # Extract the bit from each byte (from MSB to LSB)
-            bit_pos = 7 - bit
-            bit1 = (byte1 >> bit_pos) & 1
-            bit2 = (byte2 >> bit_pos) & 1
 
-            # Combine the bits to get the pixel value (0-3)
-            pixel_value = (bit2 << 1) | bit1
-            row_pixels.append(pixel_value)
+def tile_sources(position_tiles, tiles):
+    """Gather the 2bpp source bytes of 16x16 images from their tile indexes
 
-        pixels.append(row_pixels)
+    Returns an array of shape (len(position_tiles), 64) holding the four
+    16-byte tiles of each image. Tiles missing from the tileset (including
+    index 256) are zero bytes, which decode to white.
+    """
+    # Bank of 2bpp tiles by tile index; index 256 is never filled
+    tile_bank = np.zeros((257, 16), dtype=np.uint8)
+    for tile_index, tile_data in tiles.items():
+        if tile_index < 256 and tile_data:
+            tile_bank[tile_index] = np.frombuffer(tile_data, dtype=np.uint8)
 
-    return pixels
+    return tile_bank[position_tiles].reshape(-1, 64)
 
 
-def get_image_hash(img):
-    """Generate a hash for an image to identify duplicates"""
-    img_bytes = io.BytesIO()
-    img.save(img_bytes, format="PNG")
-    return hashlib.md5(img_bytes.getvalue()).hexdigest()
+def render_tile_images(sources):
+    """Decode 2bpp sources from tile_sources into 16x16 palette indices
 
+    Each tile is 8x8 pixels, with 2 bits per pixel, stored as 8 rows of 2
+    bytes; the first byte of a row holds the low bit of every pixel and the
+    second byte the high bit. Returns an array of shape (len(sources), 16, 16).
+    """
+    # (image, tile_y, tile_x, row, byte, bit), bits unpacked MSB first
+    bits = np.unpackbits(sources, axis=1).reshape(-1, 2, 2, 8, 2, 8)
 
-def extract_tile_images(conn):
-    """Extract 16x16 pixel tile images from the blocksets and tilesets"""
-    cursor = conn.cursor()
+    # Combine the bits to get the pixel values (0-3), then lay out the tiles
+    pixels = (bits[..., 1, :] << 1) | bits[..., 0, :]
+    return pixels.transpose(0, 1, 3, 2, 4).reshape(-1, 16, 16)
 
-    # Create directory for tile images if it doesn't exist
-    os.makedirs(TILE_IMAGES_DIR, exist_ok=True)
 
-    # Clean up old files
-    print("Cleaning up old tile images...")
-    old_files = list(Path(TILE_IMAGES_DIR).glob("*.png"))
-    for old_file in old_files:
-        try:
-            os.remove(old_file)
-        except Exception as e:
-            print(f"Error removing {old_file}: {e}")
-    print(f"Removed {len(old_files)} old tile images")
+def insert_tile_images(cursor, tile_images):
+    """Insert a batch of tile_images rows given in table column order"""
+    cursor.executemany(
+        """
+    INSERT INTO tile_images (
+        id, tileset_id, block_index, position, image_path, atlas_row, atlas_col, tile_data
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+        tile_images,
+    )
+
 
-    # Define GameBoy color palette (white, light gray, dark gray, black)
-    palette = [(255, 255, 255), (192, 192, 192), (96, 96, 96), (0, 0, 0)]
+def extract_tile_images(conn):
+    """Extract 16x16 pixel tile images from the blocksets and tilesets"""
+    cursor = conn.cursor()
 
     # Get all tilesets
     cursor.execute("SELECT id, name FROM tilesets")
@@ -154,14 +212,26 @@ def extract_tile_images(conn):
 
     tile_image_count = 0
     unique_image_count = 0
-    duplicate_count = 0
     total_tilesets = len(tilesets)
 
     print(f"Processing {total_tilesets} tilesets...")
     start_time = time.time()
 
-    # Dictionary to track image hashes and their corresponding IDs
-    image_hash_to_id = {}
+    # Dictionary to track image source data and the corresponding image IDs;
+    # 64 bytes per image is small enough to use the data itself as the key.
+    # It is only consulted once per distinct image of a tileset and holds one
+    # entry per row of tile_images, whose UNIQUE tile_data constraint still
+    # guards against duplicates at the storage level
+    image_key_to_id = {}
+
+    # Load the images in a single transaction
+    cursor.execute("BEGIN")
+
+    # tile_images is recreated empty by create_new_tables, so image IDs are
+    # assigned here and the rows are inserted in batches
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM tile_images")
+    next_image_id = cursor.fetchone()[0] + 1
+    pending_images = []
 
     # Dictionary to map (tileset_id, block_index, position) to tile_image_id
     block_pos_to_image_id = {}
@@ -215,128 +285,203 @@ def extract_tile_images(conn):
         blocks = {row[0]: row[1] for row in blockset_rows}
         tiles = {row[0]: row[1] for row in tile_rows}
 
-        # Process each block to create 16x16 pixel images (4 per block)
-        for block_index, block_data in blocks.items():
-            # Define the 4 positions in the block (each position is 2x2 tiles)
-            positions = [
-                # Top-left: tiles at positions 0,1,4,5
-                [(0, 0), (0, 1), (1, 0), (1, 1)],
-                # Top-right: tiles at positions 2,3,6,7
-                [(0, 2), (0, 3), (1, 2), (1, 3)],
-                # Bottom-left: tiles at positions 8,9,12,13
-                [(2, 0), (2, 1), (3, 0), (3, 1)],
-                # Bottom-right: tiles at positions 10,11,14,15
-                [(2, 2), (2, 3), (3, 2), (3, 3)],
-            ]
-
-            for pos_index, position in enumerate(positions):
-                # Create a new 16x16 image
-                img = Image.new("RGB", (16, 16), color=(255, 255, 255))
-
-                # Process each of the 4 tiles in this position
-                for i, (y, x) in enumerate(position):
-                    # Calculate the position in the block data
-                    tile_pos = y * 4 + x
-
-                    # Get the tile index from the block data
-                    if tile_pos < len(block_data):
-                        tile_index = block_data[tile_pos]
-                    else:
-                        continue
-
-                    # Get the tile data
-                    tile_data = tiles.get(tile_index)
-                    if not tile_data:
-                        continue
-
-                    # Decode the tile data
-                    tile_pixels = decode_2bpp_tile(tile_data)
-
-                    # Calculate where to place this tile in the 16x16 image
-                    offset_x = (i % 2) * 8  # 0 for left tiles, 8 for right tiles
-                    offset_y = (i // 2) * 8  # 0 for top tiles, 8 for bottom tiles
-
-                    # Draw the tile
-                    for py in range(8):
-                        for px in range(8):
-                            pixel_value = tile_pixels[py][px]
-                            pixel_color = palette[pixel_value]
-                            img.putpixel((offset_x + px, offset_y + py), pixel_color)
-
-                # Generate hash for the image
-                img_hash = get_image_hash(img)
-
-                # Check if we've already seen this image
-                if img_hash in image_hash_to_id:
-                    # Use the existing image ID
-                    existing_image_id = image_hash_to_id[img_hash]
-                    block_pos_to_image_id[(tileset_id, block_index, pos_index)] = (
-                        existing_image_id
-                    )
-                    # Special case: If this is the GYM tileset (ID 7), also store the mapping for DOJO (ID 5)
-                    if tileset_id == 7:
-                        block_pos_to_image_id[(5, block_index, pos_index)] = (
-                            existing_image_id
-                        )
-                    # Special case: If this is the POKECENTER tileset (ID 6), also store the mapping for MART (ID 2)
-                    if tileset_id == 6:
-                        block_pos_to_image_id[(2, block_index, pos_index)] = (
-                            existing_image_id
-                        )
-                    duplicate_count += 1
-                else:
-                    # Save the image with a sequential number
-                    image_path = f"{TILE_IMAGES_DIR}/tile_{unique_image_count}.png"
-                    img.save(image_path)
-
-                    # Insert the new image record
-                    cursor.execute(
-                        """
-                    INSERT INTO tile_images (tileset_id, block_index, position, image_path, image_hash)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                        (tileset_id, block_index, pos_index, image_path, img_hash),
-                    )
-
-                    # Get the new image ID
-                    image_id = cursor.lastrowid
-                    image_hash_to_id[img_hash] = image_id
-                    block_pos_to_image_id[(tileset_id, block_index, pos_index)] = (
-                        image_id
-                    )
-                    # Special case: If this is the GYM tileset (ID 7), also store the mapping for DOJO (ID 5)
-                    if tileset_id == 7:
-                        block_pos_to_image_id[(5, block_index, pos_index)] = image_id
-                    # Special case: If this is the POKECENTER tileset (ID 6), also store the mapping for MART (ID 2)
-                    if tileset_id == 6:
-                        block_pos_to_image_id[(2, block_index, pos_index)] = image_id
-                    unique_image_count += 1
-
-                tile_image_count += 1
-
-                # Commit periodically
-                if unique_image_count % BATCH_SIZE == 0:
-                    conn.commit()
-
-    conn.commit()
+        # Get the four tile indexes of each 16x16 image (4 per block) and
+        # deduplicate those first, so a repeated combination of tiles is
+        # only gathered and compared once
+        block_indexes = list(blocks)
+        position_tiles = block_position_tiles(list(blocks.values()))
+        unique_tiles, tiles_first_indexes, tiles_inverse = np.unique(
+            position_tiles, axis=0, return_index=True, return_inverse=True
+        )
+
+        # Key each combination by its 64 bytes of 2bpp source data, which
+        # identify its pixels exactly without decoding them; different
+        # combinations still match when a tileset repeats a tile
+        sources = tile_sources(unique_tiles, tiles)
+        image_keys = sources.view("V64").ravel()
+        _, key_indexes, key_inverse = np.unique(
+            image_keys, return_index=True, return_inverse=True
+        )
+        key_inverse = key_inverse.ravel()
+        inverse = key_inverse[tiles_inverse.ravel()]
+
+        # Find the first block position showing each distinct image
+        first_indexes = np.full(len(key_indexes), len(position_tiles))
+        np.minimum.at(first_indexes, key_inverse, tiles_first_indexes)
+
+        # Look up or add each distinct image, in order of first appearance
+        distinct_image_ids = np.empty(len(key_indexes), dtype=np.int64)
+        new_images = []
+        for distinct in np.argsort(first_indexes):
+            first_index = int(first_indexes[distinct])
+            source_index = int(key_indexes[distinct])
+            image_key = image_keys[source_index].tobytes()
+
+            # Check if we've already seen this image
+            image_id = image_key_to_id.get(image_key)
+            if image_id is None:
+                image_id = next_image_id
+                next_image_id += 1
+                image_key_to_id[image_key] = image_id
+                new_images.append((image_id, first_index, source_index))
+
+            distinct_image_ids[distinct] = image_id
+
+        # Decode only the images not seen before, all at once
+        new_source_indexes = [source_index for _, _, source_index in new_images]
+        new_image_data = render_tile_images(sources[new_source_indexes])
+        for (image_id, first_index, _), image_data in zip(new_images, new_image_data):
+            # Name the new image by a hash of its pixels, so the same image
+            # keeps its file name across runs; the PNG file itself is
+            # written later by export_tile_pngs
+            image_data = image_data.tobytes()
+            image_hash = hashlib.blake2b(image_data, digest_size=16).hexdigest()
+            image_path = f"{TILE_IMAGES_DIR}/{image_hash}.png"
+
+            # Queue the new image record for a batch insert
+            pending_images.append(
+                (
+                    image_id,
+                    tileset_id,
+                    block_indexes[first_index // 4],
+                    first_index % 4,
+                    image_path,
+                    unique_image_count // ATLAS_COLUMNS,
+                    unique_image_count % ATLAS_COLUMNS,
+                    image_data,
+                )
+            )
+            if len(pending_images) >= BATCH_SIZE:
+                insert_tile_images(cursor, pending_images)
+                pending_images = []
+
+            unique_image_count += 1
+
+        # Map each block position to its image
+        image_ids = distinct_image_ids[inverse].reshape(-1, 4).tolist()
+        for block_index, position_image_ids in zip(block_indexes, image_ids):
+            for pos_index, image_id in enumerate(position_image_ids):
+                block_pos_to_image_id[(tileset_id, block_index, pos_index)] = image_id
+                # Special case: If this is the GYM tileset (ID 7), also store the mapping for DOJO (ID 5)
+                if tileset_id == 7:
+                    block_pos_to_image_id[(5, block_index, pos_index)] = image_id
+                # Special case: If this is the POKECENTER tileset (ID 6), also store the mapping for MART (ID 2)
+                if tileset_id == 6:
+                    block_pos_to_image_id[(2, block_index, pos_index)] = image_id
+
+        tile_image_count += len(position_tiles)
+
+    # Insert any remaining images
+    if pending_images:
+        insert_tile_images(cursor, pending_images)
+
+    # Commit the whole load as a single transaction
+    cursor.execute("COMMIT")
     elapsed_time = time.time() - start_time
     print(f"\nProcessed {tile_image_count} tile images")
     print(f"- Unique images: {unique_image_count}")
-    print(f"- Duplicate images: {duplicate_count}")
+    print(f"- Duplicate images: {tile_image_count - unique_image_count}")
     print(f"- Total time: {elapsed_time:.2f} seconds")
 
     return block_pos_to_image_id
 
 
+def export_tile_pngs(atlas=False):
+    """Write the tile images stored in tile_images out as PNG files
+
+    Every image is written to its own image_path; those are named by content,
+    so files left by a previous run are reused. With atlas, all images are
+    also packed into a single atlas PNG at their atlas_row/atlas_col cells.
+    Uses its own connection so it can run on a background thread while the
+    tiles table is loaded.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    os.makedirs(TILE_IMAGES_DIR, exist_ok=True)
+
+    start_time = time.time()
+    cursor.execute(
+        "SELECT atlas_row, atlas_col, image_path, tile_data FROM tile_images"
+    )
+    rows = cursor.fetchall()
+    conn.close()
+    if not rows:
+        print("No tile images to write")
+        return
+
+    atlas_rows, atlas_cols, image_paths, tile_data = zip(*rows)
+
+    # Clean up PNG files that are not part of this run's output
+    expected_paths = set(image_paths)
+    if atlas:
+        expected_paths.add(TILE_ATLAS_PATH)
+    stale_count = 0
+    for entry in os.scandir(TILE_IMAGES_DIR):
+        path = f"{TILE_IMAGES_DIR}/{entry.name}"
+        if (
+            entry.is_file()
+            and entry.name.endswith(".png")
+            and path not in expected_paths
+        ):
+            os.remove(path)
+            stale_count += 1
+    if stale_count:
+        print(f"Removed {stale_count} old tile image files")
+    canvases = np.frombuffer(b"".join(tile_data), dtype=np.uint8).reshape(-1, 16, 16)
+
+    # Write PNG files on worker threads so encoding runs in parallel,
+    # skipping images whose file already exists from a previous run
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        png_futures = [
+            executor.submit(save_tile_image, canvas, image_path)
+            for canvas, image_path in zip(canvases, image_paths)
+            if not os.path.exists(image_path)
+        ]
+
+        # Wait for all PNG files to be written, re-raising any save errors
+        for future in png_futures:
+            future.result()
+    print(
+        f"Wrote {len(png_futures)} tile image files "
+        f"({len(rows) - len(png_futures)} already up to date)"
+    )
+
+    if atlas:
+        # Pack the images into the atlas grid and write it with a single encode
+        atlas_grid = np.zeros(
+            (max(atlas_rows) + 1, ATLAS_COLUMNS, 16, 16), dtype=np.uint8
+        )
+        atlas_grid[list(atlas_rows), list(atlas_cols)] = canvases
+        atlas_grid = atlas_grid.transpose(0, 2, 1, 3).reshape(-1, ATLAS_COLUMNS * 16)
+        save_tile_image(atlas_grid, TILE_ATLAS_PATH)
+        print(f"Wrote atlas of {len(rows)} tile images to {TILE_ATLAS_PATH}")
+
+    elapsed_time = time.time() - start_time
+    print(f"Wrote tile images in {elapsed_time:.2f} seconds")
+
+
+def build_tile_image_lut(block_pos_to_image_id):
+    """Build a (tileset_id, block_index, position) -> tile_image_id array
+
+    Missing entries are 0. Positions without their own image fall back to the
+    image at position 0 of the same block, and blocks without any image stay 0.
+    """
+    if not block_pos_to_image_id:
+        return np.zeros((1, 1, 4), dtype=np.int64)
+
+    keys = np.array(list(block_pos_to_image_id.keys()), dtype=np.int64)
+    lut = np.zeros((keys[:, 0].max() + 1, keys[:, 1].max() + 1, 4), dtype=np.int64)
+    lut[keys[:, 0], keys[:, 1], keys[:, 2]] = list(block_pos_to_image_id.values())
+
+    # Try with a default position if specific position not found
+    return np.where(lut > 0, lut, lut[:, :, :1])
+
+
 def populate_tiles(conn, block_pos_to_image_id):
     """Populate the tiles table based on the tiles_raw and maps tables"""
     cursor = conn.cursor()
 
-    # Clear the tiles table before repopulating
-    print("Clearing existing tiles...")
-    cursor.execute("DELETE FROM tiles")
-    conn.commit()
-
     # Check if the tiles_raw table exists
     cursor.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name='tiles_raw'"
@@ -347,26 +492,17 @@ def populate_tiles(conn, block_pos_to_image_id):
         print("Error: tiles_raw table does not exist. Please run export_map.py first.")
         return
 
-    # Get all maps with their is_overworld flag
-    cursor.execute(
-        """
-    SELECT id, name, width, height, tileset_id, is_overworld
-    FROM maps
-    """
-    )
+    # Load the tiles in a single transaction
+    cursor.execute("BEGIN")
 
-    maps = cursor.fetchall()
-    total_maps = len(maps)
+    # Clear the tiles table before repopulating
+    print("Clearing existing tiles...")
+    cursor.execute("DELETE FROM tiles")
 
-    print(f"Processing {total_maps} maps...")
-    tile_count = 0
-    processed_maps = 0
-    skipped_maps = 0
-    skipped_map_names = []
     start_time = time.time()
 
-    # Prepare for batch insert
-    tiles_data = []
+    # Lookup table of (tileset_id, block_index, position) -> tile_image_id
+    tile_image_lut = build_tile_image_lut(block_pos_to_image_id)
 
     # Get the overworld map positions if available
     cursor.execute(
@@ -382,123 +518,99 @@ def populate_tiles(conn, block_pos_to_image_id):
         for map_name, x_offset, y_offset in cursor.fetchall():
             map_positions[map_name] = (x_offset, y_offset)
 
-    # Process each map
-    for i, (
-        map_id,
-        map_name,
-        width,
-        height,
-        tileset_id,
-        is_overworld,
-    ) in enumerate(maps, 1):
-        # Update progress every 5 maps
-        if i % 5 == 0 or i == total_maps:
-            sys.stdout.write(
-                f"\rProcessed {i}/{total_maps} maps, created {tile_count} tiles"
-            )
-            sys.stdout.flush()
-
-        processed_maps += 1
-
-        # Get position offsets for this map if it's an overworld map
-        x_offset, y_offset = 0, 0
+    # Get all maps with their is_overworld flag and position offsets
+    cursor.execute("SELECT id, name, is_overworld FROM maps")
+    maps = cursor.fetchall()
+    print(f"Processing {len(maps)} maps...")
+
+    # Read all raw tiles in one query, streaming the rows straight into an
+    # array without materializing a list of tuples; columns: map_id, x, y,
+    # block_index, tileset_id
+    cursor.execute("SELECT map_id, x, y, block_index, tileset_id FROM tiles_raw")
+    raw = np.fromiter(itertools.chain.from_iterable(cursor), dtype=np.int64)
+    raw = raw.reshape(-1, 5)
+
+    # Lookup tables indexed by map ID; only overworld maps are offset
+    lut_size = max([map_id + 1 for map_id, _, _ in maps] + [0])
+    map_exists = np.zeros(lut_size, dtype=bool)
+    map_is_overworld = np.zeros(lut_size, dtype=np.int64)
+    map_offsets = np.zeros((lut_size, 2), dtype=np.int64)
+    for map_id, map_name, is_overworld in maps:
+        map_exists[map_id] = True
+        map_is_overworld[map_id] = is_overworld
         if is_overworld and map_name in map_positions:
-            x_offset, y_offset = map_positions[map_name]
+            map_offsets[map_id] = map_positions[map_name]
+
+    # Skip raw tiles of maps that no longer exist
+    raw = raw[(raw[:, 0] >= 0) & (raw[:, 0] < lut_size)]
+    raw = raw[map_exists[raw[:, 0]]]
+    map_ids, raw_x, raw_y, block_indexes, raw_tileset_ids = raw.T
+    processed_maps = len(np.unique(map_ids))
+
+    # Special case: Map DOJO (tileset ID 5) to GYM (tileset ID 7)
+    # This is because in the original game, DOJO uses the same graphics as GYM
+    # Special case: Map MART (tileset ID 2) to POKECENTER (tileset ID 6)
+    # This is because marts and pokecenters share similar interior graphics
+    lookup_tileset_ids = np.where(
+        raw_tileset_ids == 5,
+        7,
+        np.where(raw_tileset_ids == 2, 6, raw_tileset_ids),
+    )
 
-        # Get raw tile data for this map from tiles_raw table
-        cursor.execute(
-            """
-        SELECT x, y, block_index, tileset_id, is_overworld
-        FROM tiles_raw
-        WHERE map_id = ?
-        """,
-            (map_id,),
+    # Look up the tile_image_id of all 4 positions of every block at once;
+    # blocks outside the lookup table have no images (ID 0)
+    in_range = (lookup_tileset_ids < tile_image_lut.shape[0]) & (
+        block_indexes < tile_image_lut.shape[1]
+    )
+    tile_image_ids = tile_image_lut[
+        np.where(in_range, lookup_tileset_ids, 0),
+        np.where(in_range, block_indexes, 0),
+    ]
+    tile_image_ids[~in_range] = 0
+
+    # Each block corresponds to 4 tiles (2x2 grid), each block is 2x2
+    # tiles so block coordinates are multiplied by 2
+    tile_x = raw_x[:, None] * 2 + POSITION_DX + map_offsets[map_ids, 0][:, None]
+    tile_y = raw_y[:, None] * 2 + POSITION_DY + map_offsets[map_ids, 1][:, None]
+    tile_map_ids = np.broadcast_to(map_ids[:, None], tile_x.shape)
+
+    # Skip tiles with no image
+    has_image = tile_image_ids > 0
+    tile_x = tile_x[has_image]
+    tile_y = tile_y[has_image]
+    tile_map_ids = tile_map_ids[has_image]
+    tile_image_ids = tile_image_ids[has_image]
+
+    # Sort the tiles by the primary key (map_id, local_x, local_y), so the
+    # clustered table is filled in key order
+    order = np.lexsort((tile_y, tile_x, tile_map_ids))
+    tile_x = tile_x[order]
+    tile_y = tile_y[order]
+    tile_map_ids = tile_map_ids[order]
+    tiles_data = np.column_stack(
+        (
+            tile_x,
+            tile_y,
+            tile_x,
+            tile_y,
+            tile_map_ids,
+            tile_image_ids[order],
+            map_is_overworld[tile_map_ids],
         )
+    )
+    tile_count = len(tiles_data)
 
-        raw_tiles = cursor.fetchall()
-
-        if not raw_tiles:
-            continue
-
-        # Collect tiles for this map
-        map_tiles = []
-
-        # Process each raw tile
-        for raw_x, raw_y, block_index, raw_tileset_id, raw_is_overworld in raw_tiles:
-            # Special case: Map DOJO (tileset ID 5) to GYM (tileset ID 7)
-            # This is because in the original game, DOJO uses the same graphics as GYM
-            lookup_tileset_id = 7 if raw_tileset_id == 5 else raw_tileset_id
-            # Special case: Map MART (tileset ID 2) to POKECENTER (tileset ID 6)
-            # This is because marts and pokecenters share similar interior graphics
-            if raw_tileset_id == 2:
-                lookup_tileset_id = 6
-
-            # Each block corresponds to 4 tiles (2x2 grid)
-            # We need to create 4 entries in the tiles table
-            for position in range(4):
-                # Calculate the actual x, y coordinates for this tile
-                # Each block is 2x2 tiles, so we need to multiply by 2
-                tile_x = raw_x * 2 + (position % 2) + x_offset
-                tile_y = raw_y * 2 + (position // 2)
-
-                # Add y_offset if applicable (for maps with position data)
-                if map_name in map_positions:
-                    tile_y += y_offset
-
-                # Get the tile_image_id from our dictionary
-                tile_image_id = block_pos_to_image_id.get(
-                    (lookup_tileset_id, block_index, position)
-                )
-                if not tile_image_id:
-                    # Try with a default position if specific position not found
-                    tile_image_id = block_pos_to_image_id.get(
-                        (lookup_tileset_id, block_index, 0)
-                    )
-                    if not tile_image_id:
-                        continue
-
-                # Add to map tiles
-                map_tiles.append(
-                    (
-                        tile_x,
-                        tile_y,
-                        tile_x,
-                        tile_y,
-                        map_id,
-                        tile_image_id,
-                        is_overworld,
-                    )
-                )
-
-        # Sort map tiles by y-coordinate in descending order (top to bottom becomes bottom to top)
-        map_tiles.sort(key=lambda t: (-t[1], t[0]))
-
-        # Add to batch insert data
-        tiles_data.extend(map_tiles)
-        tile_count += len(map_tiles)
-
-        # Execute batch insert if we've reached the batch size
-        if len(tiles_data) >= BATCH_SIZE:
-            cursor.executemany(
-                """
-            INSERT INTO tiles (x, y, local_x, local_y, map_id, tile_image_id, is_overworld)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                tiles_data,
-            )
-            conn.commit()
-            tiles_data = []
-
-    # Insert any remaining tiles
-    if tiles_data:
+    # Insert the tiles in batches
+    for batch_start in range(0, tile_count, BATCH_SIZE):
         cursor.executemany(
             """
         INSERT INTO tiles (x, y, local_x, local_y, map_id, tile_image_id, is_overworld)
         VALUES (?, ?, ?, ?, ?, ?, ?)
         """,
-            tiles_data,
+            tiles_data[batch_start : batch_start + BATCH_SIZE].tolist(),
         )
-        conn.commit()
+    # Commit the whole load as a single transaction
+    cursor.execute("COMMIT")
 
     elapsed_time = time.time() - start_time
     print(
@@ -506,37 +618,78 @@ def populate_tiles(conn, block_pos_to_image_id):
     )
 
 
-def main():
+def main(skip_pngs=False, atlas=False):
     """Main function"""
     total_start_time = time.time()
 
     print("Creating new tables...")
     conn = create_new_tables()
-
-    print("\nExtracting tile images...")
-    block_pos_to_image_id = extract_tile_images(conn)
-
-    print("\nPopulating tiles table...")
-    populate_tiles(conn, block_pos_to_image_id)
-
-    # Print summary
     cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM tile_images")
-    tile_image_count = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM tiles")
-    tile_count = cursor.fetchone()[0]
-
-    total_elapsed_time = time.time() - total_start_time
-
-    print("\nSummary:")
-    print(f"- Extracted {tile_image_count} unique tile images")
-    print(f"- Created {tile_count} tiles")
-    print(f"- Total time: {total_elapsed_time:.2f} seconds")
-
-    print("\nDone!")
-    conn.close()
+    png_writer = ThreadPoolExecutor(max_workers=1)
+
+    try:
+        print("\nExtracting tile images...")
+        block_pos_to_image_id = extract_tile_images(conn)
+
+        # Write the PNG files in the background while the tiles table is
+        # loaded; they only depend on the tile_images rows committed above
+        png_future = None
+        if not skip_pngs:
+            print("\nWriting tile images in the background...")
+            png_future = png_writer.submit(export_tile_pngs, atlas)
+
+        print("\nPopulating tiles table...")
+        populate_tiles(conn, block_pos_to_image_id)
+
+        print("\nCreating tile indexes...")
+        create_tile_indexes(conn)
+
+        # Wait for the PNG files, re-raising any write errors
+        if png_future is not None:
+            png_future.result()
+
+        # Print summary
+        cursor.execute("SELECT COUNT(*) FROM tile_images")
+        tile_image_count = cursor.fetchone()[0]
+
+        cursor.execute("SELECT COUNT(*) FROM tiles")
+        tile_count = cursor.fetchone()[0]
+
+        total_elapsed_time = time.time() - total_start_time
+
+        print("\nSummary:")
+        print(f"- Extracted {tile_image_count} unique tile images")
+        print(f"- Created {tile_count} tiles")
+        print(f"- Total time: {total_elapsed_time:.2f} seconds")
+
+        print("\nDone!")
+    finally:
+        # Wait for the PNG writer so its connection is closed, and end any
+        # load transaction left open by an error; then the database can be
+        # switched back from WAL journaling, even if the run failed
+        png_writer.shutdown()
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        finish_bulk_load(cursor)
+        # Close the cursor first, as the traceback of a failed run keeps it
+        # alive and its unfinished PRAGMA statement would keep the file locked
+        cursor.close()
+        conn.close()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Create the tiles and tile_images tables from exported map data"
+    )
+    parser.add_argument(
+        "--skip-pngs",
+        action="store_true",
+        help="Only store tile pixels in the database, without writing PNG files",
+    )
+    parser.add_argument(
+        "--atlas",
+        action="store_true",
+        help="Also pack all tile images into a single atlas PNG (see atlas_row/atlas_col)",
+    )
+    args = parser.parse_args()
+    main(skip_pngs=args.skip_pngs, atlas=args.atlas)
@@ -70,7 +70,8 @@ async function runExports() {
   }
   log("Map export successful");
 
-  // Run create zones and tiles
+  // Run create zones and tiles; writes one PNG per tile image (image_path).
+  // The atlas PNG (atlas_row/atlas_col) is opt-in: run the script with --atlas
   const zonesAndTilesSuccess = runCommand(
     "python3 export_scripts/create_zones_and_tiles.py"
   );
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import functools
 import os
 import re
 import sqlite3
@@ -12,6 +13,17 @@ POKEMON_DATA_DIR = BASE_DIR / "pokemon-game-data/data/items"
 CONSTANTS_DIR = BASE_DIR / "pokemon-game-data/constants"
 MOVES_DATA_DIR = BASE_DIR / "pokemon-game-data/data/moves"
 
+# Regular expressions
+ITEM_CONST_PATTERN = re.compile(r"const\s+(\w+)\s*;\s*\$([0-9A-F]+)")
+ITEM_NAME_PATTERN = re.compile(r'li\s+"([^"]+)"')
+ITEM_PRICE_PATTERN = re.compile(r"bcd3\s+(\d+)")
+KEY_ITEM_PATTERN = re.compile(r"dbit\s+(TRUE|FALSE)\s*;\s*(\w+)")
+DB_ITEM_PATTERN = re.compile(r"db\s+(\w+)")
+VENDING_PRICE_PATTERN = re.compile(r"vend_item\s+(\w+),\s+(\d+)")
+ADD_TM_PATTERN = re.compile(r"add_tm\s+(\w+)")
+ADD_HM_PATTERN = re.compile(r"add_hm\s+(\w+)")
+MOVE_CONST_PATTERN = re.compile(r"const\s+(\w+)\s*;\s*([0-9a-fA-F]+)")
+
 
 def create_database():
     """Create SQLite database and tables"""
@@ -44,35 +56,35 @@ def create_database():
     return conn, cursor
 
 
+@functools.lru_cache(maxsize=None)
+def read_asm_file(path):
+    """Read an .asm file, caching its contents for parsers that share a file
+
+    item_constants.asm is parsed for both the item constants and the TM/HM moves.
+    """
+    with open(path, "rb") as f:
+        # The files are ASCII except for a few item names such as "POKé BALL"
+        return f.read().decode("utf-8")
+
+
 def parse_item_constants():
     """Parse item constants to get item IDs and short names"""
     item_constants_path = CONSTANTS_DIR / "item_constants.asm"
 
-    with open(item_constants_path, "r") as f:
-        content = f.read()
+    content = read_asm_file(item_constants_path)
 
     # Extract item constants
-    item_constants = {}
-    pattern = r"const\s+(\w+)\s*;\s*\$([0-9A-F]+)"
-    matches = re.finditer(pattern, content)
-
-    for match in matches:
-        short_name = match.group(1)
-        item_id = int(match.group(2), 16)
-        item_constants[short_name] = item_id
-
-    return item_constants
+    return {
+        short_name: int(item_id, 16)
+        for short_name, item_id in ITEM_CONST_PATTERN.findall(content)
+    }
 
 
 def parse_item_names():
     """Parse item names from names.asm"""
     names_path = POKEMON_DATA_DIR / "names.asm"
 
-    with open(names_path, "r") as f:
-        content = f.read()
-
-    # Extract item names
-    item_names = []
+    content = read_asm_file(names_path)
 
     # Find the position of the first assert_list_length NUM_ITEMS
     assert_pos = content.find("assert_list_length NUM_ITEMS")
@@ -82,154 +94,72 @@ def parse_item_names():
     else:
         content_to_parse = content
 
-    pattern = r'li\s+"([^"]+)"'
-    matches = re.finditer(pattern, content_to_parse)
-
-    for match in matches:
-        item_name = match.group(1)
-        item_names.append(item_name)
-
-    return item_names
+    # Extract item names
+    return ITEM_NAME_PATTERN.findall(content_to_parse)
 
 
 def parse_item_prices():
     """Parse item prices from prices.asm"""
     prices_path = POKEMON_DATA_DIR / "prices.asm"
 
-    with open(prices_path, "r") as f:
-        content = f.read()
+    content = read_asm_file(prices_path)
 
     # Extract item prices
-    item_prices = []
-    pattern = r"bcd3\s+(\d+)"
-    matches = re.finditer(pattern, content)
-
-    for match in matches:
-        price = int(match.group(1))
-        item_prices.append(price)
-
-    return item_prices
+    return [int(price) for price in ITEM_PRICE_PATTERN.findall(content)]
 
 
 def parse_key_items():
     """Parse key items from key_items.asm"""
     key_items_path = POKEMON_DATA_DIR / "key_items.asm"
 
-    with open(key_items_path, "r") as f:
-        content = f.read()
-
-    # Extract key items
-    key_items = []
-    pattern = r"dbit\s+(TRUE|FALSE)\s*;\s*(\w+)"
-    matches = re.finditer(pattern, content)
-
-    for match in matches:
-        is_key = match.group(1) == "TRUE"
-        item_name = match.group(2)
-        key_items.append((item_name, is_key))
-
-    return key_items
-
-
-def parse_party_menu_items():
-    """Parse items that use party menu from use_party.asm"""
-    party_menu_path = POKEMON_DATA_DIR / "use_party.asm"
-
-    with open(party_menu_path, "r") as f:
-        content = f.read()
-
-    # Extract party menu items
-    party_menu_items = []
-    pattern = r"db\s+(\w+)"
-    matches = re.finditer(pattern, content)
+    content = read_asm_file(key_items_path)
 
-    for match in matches:
-        item_name = match.group(1)
-        if item_name != "-1":  # Skip the end marker
-            party_menu_items.append(item_name)
+    # Extract key items as (item_name, is_key) pairs
+    return [
+        (item_name, is_key == "TRUE")
+        for is_key, item_name in KEY_ITEM_PATTERN.findall(content)
+    ]
 
-    return party_menu_items
 
+def parse_db_item_list(file_name, end_marker):
+    """Parse a db list of item names, such as use_party.asm, into a set
 
-def parse_overworld_items():
-    """Parse items usable in overworld from use_overworld.asm"""
-    overworld_path = POKEMON_DATA_DIR / "use_overworld.asm"
-
-    with open(overworld_path, "r") as f:
-        content = f.read()
-
-    # Extract overworld items
-    overworld_items = []
-    pattern = r"db\s+(\w+)"
-    matches = re.finditer(pattern, content)
-
-    for match in matches:
-        item_name = match.group(1)
-        if item_name != "-1":  # Skip the end marker
-            overworld_items.append(item_name)
-
-    return overworld_items
-
-
-def parse_guard_drink_items():
-    """Parse guard drink items from guard_drink_items.asm"""
-    guard_drink_path = POKEMON_DATA_DIR / "guard_drink_items.asm"
-
-    with open(guard_drink_path, "r") as f:
-        content = f.read()
-
-    # Extract guard drink items
-    guard_drink_items = []
-    pattern = r"db\s+(\w+)"
-    matches = re.finditer(pattern, content)
-
-    for match in matches:
-        item_name = match.group(1)
-        if item_name != "0":  # Skip the end marker
-            guard_drink_items.append(item_name)
+    end_marker is the value that terminates the list and is skipped.
+    """
+    content = read_asm_file(POKEMON_DATA_DIR / file_name)
 
-    return guard_drink_items
+    return frozenset(
+        item_name
+        for item_name in DB_ITEM_PATTERN.findall(content)
+        if item_name != end_marker
+    )
 
 
 def parse_vending_prices():
     """Parse vending prices from vending_prices.asm"""
     vending_path = POKEMON_DATA_DIR / "vending_prices.asm"
 
-    with open(vending_path, "r") as f:
-        content = f.read()
+    content = read_asm_file(vending_path)
 
     # Extract vending prices
-    vending_prices = {}
-    pattern = r"vend_item\s+(\w+),\s+(\d+)"
-    matches = re.finditer(pattern, content)
-
-    for match in matches:
-        item_name = match.group(1)
-        price = int(match.group(2))
-        vending_prices[item_name] = price
-
-    return vending_prices
+    return {
+        item_name: int(price)
+        for item_name, price in VENDING_PRICE_PATTERN.findall(content)
+    }
 
 
-def parse_tm_hm_moves():
+def parse_tm_hm_moves(move_constants):
     """Parse TM/HM move IDs from item_constants.asm and move_constants.asm"""
     tm_hm_moves = {}
 
     # Read item_constants.asm to get TM/HM move mappings
     item_constants_path = CONSTANTS_DIR / "item_constants.asm"
 
-    with open(item_constants_path, "r") as f:
-        content = f.read()
+    content = read_asm_file(item_constants_path)
 
     # Extract TM move mappings
     # Format: add_tm MOVE_NAME (creates TM_MOVE_NAME constant and TM##_MOVE = MOVE_NAME)
-    tm_pattern = r"add_tm\s+(\w+)"
-    tm_matches = re.finditer(tm_pattern, content)
-
-    tm_moves = []
-    for match in tm_matches:
-        move_name = match.group(1)
-        tm_moves.append(move_name)
+    tm_moves = ADD_TM_PATTERN.findall(content)
 
     print(f"Found {len(tm_moves)} TM moves")
 
@@ -237,20 +167,14 @@ def parse_tm_hm_moves():
     tm_count = 0
     for i, move_name in enumerate(tm_moves):
         item_id = 0xC9 + i
-        move_id = get_move_id_by_name(move_name)
+        move_id = get_move_id_by_name(move_name, move_constants)
         if move_id:
             tm_hm_moves[item_id] = move_id
             tm_count += 1
 
     # Extract HM move mappings
     # Format: add_hm MOVE_NAME (creates HM_MOVE_NAME constant and HM##_MOVE = MOVE_NAME)
-    hm_pattern = r"add_hm\s+(\w+)"
-    hm_matches = re.finditer(hm_pattern, content)
-
-    hm_moves = []
-    for match in hm_matches:
-        move_name = match.group(1)
-        hm_moves.append(move_name)
+    hm_moves = ADD_HM_PATTERN.findall(content)
 
     print(f"Found {len(hm_moves)} HM moves")
 
@@ -258,7 +182,7 @@ def parse_tm_hm_moves():
     hm_count = 0
     for i, move_name in enumerate(hm_moves):
         item_id = 0xC4 + i
-        move_id = get_move_id_by_name(move_name)
+        move_id = get_move_id_by_name(move_name, move_constants)
         if move_id:
             tm_hm_moves[item_id] = move_id
             hm_count += 1
@@ -266,23 +190,26 @@ def parse_tm_hm_moves():
     return tm_hm_moves
 
 
-def get_move_id_by_name(move_name):
-    """Get move ID by name from move_constants.asm"""
+def parse_move_constants():
+    """Parse move constants to get move IDs by name from move_constants.asm"""
     move_constants_path = CONSTANTS_DIR / "move_constants.asm"
 
-    with open(move_constants_path, "r") as f:
-        content = f.read()
+    content = read_asm_file(move_constants_path)
 
-    # Find the move constant and get its ID
     # In move_constants.asm, moves are defined as:
     # const MOVE_NAME ; XX (where XX is the hex ID)
-    pattern = r"const\s+(" + re.escape(move_name) + r")\s*;\s*([0-9a-fA-F]+)"
-    match = re.search(pattern, content)
+    move_constants = {}
+    for move_name, move_id in MOVE_CONST_PATTERN.findall(content):
+        # Keep the first definition of each name
+        move_constants.setdefault(move_name, int(move_id, 16))
+
+    return move_constants
 
-    if match:
-        # Convert hex value to decimal
-        move_id = int(match.group(2), 16)
-        return move_id
+
+def get_move_id_by_name(move_name, move_constants):
+    """Get move ID by name from the parsed move constants"""
+    if move_name in move_constants:
+        return move_constants[move_name]
 
     # If not found directly, try with different formats
     # Some moves have special names like PSYCHIC_M instead of PSYCHIC
@@ -291,19 +218,14 @@ def get_move_id_by_name(move_name):
     }
 
     if move_name in special_cases:
-        alt_name = special_cases[move_name]
-        pattern = r"const\s+(" + re.escape(alt_name) + r")\s*;\s*([0-9a-fA-F]+)"
-        match = re.search(pattern, content)
-        if match:
-            move_id = int(match.group(2), 16)
-            return move_id
+        return move_constants.get(special_cases[move_name])
 
     # Return None if move not found (no warning)
     return None
 
 
 def is_item_usable(item_name, overworld_items, party_menu_items):
-    """Determine if an item is usable based on overworld and party menu lists"""
+    """Determine if an item is usable based on overworld and party menu sets"""
     return item_name in overworld_items or item_name in party_menu_items
 
 
@@ -316,11 +238,14 @@ def main():
     item_names = parse_item_names()
     item_prices = parse_item_prices()
     key_items_data = parse_key_items()
-    party_menu_items = parse_party_menu_items()
-    overworld_items = parse_overworld_items()
-    guard_drink_items = parse_guard_drink_items()
+    # Items that use the party menu, are usable in the overworld, and are
+    # guard drinks
+    party_menu_items = parse_db_item_list("use_party.asm", "-1")
+    overworld_items = parse_db_item_list("use_overworld.asm", "-1")
+    guard_drink_items = parse_db_item_list("guard_drink_items.asm", "0")
     vending_prices = parse_vending_prices()
-    tm_hm_moves = parse_tm_hm_moves()
+    move_constants = parse_move_constants()
+    tm_hm_moves = parse_tm_hm_moves(move_constants)
 
     # Create reverse mapping for item constants
     item_id_to_name = {v: k for k, v in item_constants.items()}
@@ -330,8 +255,8 @@ def main():
     for item_name, is_key in key_items_data:
         key_item_map[item_name] = is_key
 
-    # Insert items into database
-    item_count = 0
+    # Collect the item rows and insert them all at once
+    item_rows = []
     for i, name in enumerate(item_names):
         item_id = i + 1  # Item IDs start at 1
         short_name = item_id_to_name.get(item_id, f"UNKNOWN_{item_id}")
@@ -358,14 +283,7 @@ def main():
         # Get move ID if it's a TM/HM
         move_id = tm_hm_moves.get(item_id)
 
-        # Insert into database
-        cursor.execute(
-            """
-        INSERT INTO items (
-            id, name, short_name, price, is_usable, uses_party_menu, 
-            vending_price, move_id, is_guard_drink, is_key_item
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+        item_rows.append(
             (
                 item_id,
                 name,
@@ -377,22 +295,23 @@ def main():
                 move_id,
                 1 if is_guard_drink else 0,
                 1 if is_key_item else 0,
-            ),
+            )
         )
-        item_count += 1
 
-    # Read move names for TM/HM items
-    move_names = {}
-    move_constants_path = CONSTANTS_DIR / "move_constants.asm"
-    with open(move_constants_path, "r") as f:
-        content = f.read()
-
-    pattern = r"const\s+(\w+)\s*;\s*([0-9a-fA-F]+)"
-    matches = re.finditer(pattern, content)
-    for match in matches:
-        move_name = match.group(1)
-        move_id = int(match.group(2), 16)
-        move_names[move_id] = move_name
+    # Insert into database
+    cursor.executemany(
+        """
+    INSERT INTO items (
+        id, name, short_name, price, is_usable, uses_party_menu, 
+        vending_price, move_id, is_guard_drink, is_key_item
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+        item_rows,
+    )
+    item_count = len(item_rows)
+
+    # Get move names for TM/HM items
+    move_names = {move_id: move_name for move_name, move_id in move_constants.items()}
 
     # Get the next available item ID
     cursor.execute("SELECT MAX(id) FROM items")
@@ -31,8 +31,13 @@ import subprocess
 from pathlib import Path
 import binascii
 import argparse
+import sys
 from PIL import Image, ImageDraw
 
+# Add the root directory to the Python path to allow imports from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.sqlite_utils import configure_bulk_load, finish_bulk_load
+
 # Constants
 # Get the project root directory (parent of the script's directory)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -60,6 +65,9 @@ def create_database():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
+    # Tune SQLite for bulk loading
+    configure_bulk_load(cursor)
+
     # Drop existing tables if they exist
     cursor.execute("DROP TABLE IF EXISTS maps")
     cursor.execute("DROP TABLE IF EXISTS tilesets")
@@ -418,7 +426,19 @@ def extract_tileset_data():
     return tileset_data
 
 
-def find_matching_blk_file(map_name, map_data):
+def build_blk_name_index(map_data):
+    """Index the .blk file names by lowercase name for case-insensitive lookups
+
+    Maps each lowercase name to (position, blk_name) of the first .blk file
+    with that name, so ties resolve in map_data order.
+    """
+    blk_name_index = {}
+    for position, blk_name in enumerate(map_data):
+        blk_name_index.setdefault(blk_name.lower(), (position, blk_name))
+    return blk_name_index
+
+
+def find_matching_blk_file(map_name, map_data, blk_name_index):
     """Find a matching .blk file for a map name using various transformations"""
     # Try direct match
     if map_name in map_data:
@@ -429,13 +449,15 @@ def find_matching_blk_file(map_name, map_data):
     if no_underscores in map_data:
         return no_underscores
 
-    # Try case-insensitive match
-    for blk_name in map_data.keys():
-        if (
-            blk_name.lower() == map_name.lower()
-            or blk_name.lower() == no_underscores.lower()
-        ):
-            return blk_name
+    # Try case-insensitive match, preferring the first .blk file in map_data
+    # order that matches either form
+    case_insensitive_matches = [
+        blk_name_index[name.lower()]
+        for name in (map_name, no_underscores)
+        if name.lower() in blk_name_index
+    ]
+    if case_insensitive_matches:
+        return min(case_insensitive_matches)[1]
 
     # Try partial match (map name is part of the blk file name)
     for blk_name in map_data.keys():
@@ -589,8 +611,8 @@ def render_map(map_name):
         print(f"Map {map_name} has no block data")
         return None
 
-    # Convert hex string to bytes
-    blk_bytes = bytes.fromhex(blk_data)
+    # blk_data is stored as the raw bytes of the .blk file
+    blk_bytes = blk_data
 
     # Get blockset data for this tileset
     cursor.execute(
@@ -700,6 +722,12 @@ def main():
     tileset_constants = load_tileset_constants()
     map_headers, map_to_constant, map_connections = extract_map_headers()
     map_data = extract_map_data()
+    blk_name_index = build_blk_name_index(map_data)
+
+    # Index the map headers by map constant, keeping the first header of each map
+    headers_by_map_id = {}
+    for header_data in map_headers.values():
+        headers_by_map_id.setdefault(header_data["map_id"], header_data)
     tileset_data = extract_tileset_data()
 
     # Insert tileset data
@@ -723,11 +751,13 @@ def main():
             blockset_path = tileset_info["blockset_path"]
             if os.path.exists(blockset_path):
                 blocks = parse_blockset_file(blockset_path)
-                for block_index, block_data in enumerate(blocks):
-                    cursor.execute(
-                        "INSERT INTO blocksets (tileset_id, block_index, block_data) VALUES (?, ?, ?)",
-                        (tileset_id, block_index, block_data),
-                    )
+                cursor.executemany(
+                    "INSERT INTO blocksets (tileset_id, block_index, block_data) VALUES (?, ?, ?)",
+                    [
+                        (tileset_id, block_index, block_data)
+                        for block_index, block_data in enumerate(blocks)
+                    ],
+                )
                 print(f"Inserted {len(blocks)} blocks for tileset {tileset_name}")
             else:
                 print(f"Warning: Blockset file not found: {blockset_path}")
@@ -736,11 +766,13 @@ def main():
             tileset_2bpp_path = tileset_info["tileset_2bpp_path"]
             if tileset_2bpp_path and os.path.exists(tileset_2bpp_path):
                 tiles = parse_2bpp_file(tileset_2bpp_path)
-                for tile_index, tile_data in enumerate(tiles):
-                    cursor.execute(
-                        "INSERT INTO tileset_tiles (tileset_id, tile_index, tile_data) VALUES (?, ?, ?)",
-                        (tileset_id, tile_index, tile_data),
-                    )
+                cursor.executemany(
+                    "INSERT INTO tileset_tiles (tileset_id, tile_index, tile_data) VALUES (?, ?, ?)",
+                    [
+                        (tileset_id, tile_index, tile_data)
+                        for tile_index, tile_data in enumerate(tiles)
+                    ],
+                )
                 print(f"Inserted {len(tiles)} tiles for tileset {tileset_name}")
             else:
                 print(f"Warning: 2bpp file not found: {tileset_2bpp_path}")
@@ -753,11 +785,7 @@ def main():
     overworld_maps = {}
     for map_name, map_info in map_constants.items():
         # Find the corresponding map header
-        header_info = None
-        for header_name, header_data in map_headers.items():
-            if header_data["map_id"] == map_name:
-                header_info = header_data
-                break
+        header_info = headers_by_map_id.get(map_name)
 
         if not header_info:
             header_info = {}
@@ -785,11 +813,7 @@ def main():
         map_id = map_info["id"]
 
         # Find the corresponding map header
-        header_info = None
-        for header_name, header_data in map_headers.items():
-            if header_data["map_id"] == map_name:
-                header_info = header_data
-                break
+        header_info = headers_by_map_id.get(map_name)
 
         if not header_info:
             header_info = {}
@@ -802,7 +826,7 @@ def main():
                 tileset_match_count += 1
 
         # Find the corresponding .blk file
-        blk_name = find_matching_blk_file(map_name, map_data)
+        blk_name = find_matching_blk_file(map_name, map_data, blk_name_index)
         blk_data = None
         if blk_name:
             blk_data = map_data[blk_name]["blk_data"]
@@ -881,11 +905,7 @@ def main():
         height = map_info["height"]
 
         # Find the corresponding map header to get tileset
-        header_info = None
-        for header_name, header_data in map_headers.items():
-            if header_data["map_id"] == map_name:
-                header_info = header_data
-                break
+        header_info = headers_by_map_id.get(map_name)
 
         if not header_info:
             continue
@@ -902,69 +922,39 @@ def main():
         is_overworld = tileset_id == 0
 
         # Find the corresponding .blk file
-        blk_name = find_matching_blk_file(map_name, map_data)
+        blk_name = find_matching_blk_file(map_name, map_data, blk_name_index)
         if not blk_name or not map_data[blk_name]["blk_data"]:
             continue
 
-        blk_data = map_data[blk_name]["blk_data"]
+        # extract_map_data reads blk_data from the .blk file as bytes, which
+        # are used without copying (indexing bytes already yields ints)
+        blk_bytes = map_data[blk_name]["blk_data"]
 
-        # Convert blk_data to a list of integers
-        try:
-            # If blk_data is already a bytes object
-            if isinstance(blk_data, bytes):
-                blk_bytes = list(blk_data)
-            # If blk_data is a string representation of hex
-            elif isinstance(blk_data, str) and all(
-                c in "0123456789ABCDEFabcdef" for c in blk_data
-            ):
-                blk_bytes = [
-                    int(blk_data[i : i + 2], 16) for i in range(0, len(blk_data), 2)
-                ]
-            else:
-                # Try to convert from binary string
-                blk_bytes = list(map(ord, blk_data))
-        except Exception as e:
-            print(f"Error processing blk_data for map {map_name}: {e}")
-            continue
-
-        # Verify we have the expected number of blocks
+        # Truncate or pad with zeros to the expected number of blocks
         expected_blocks = width * height
-        if len(blk_bytes) < expected_blocks:
-            # Pad with zeros if needed
-            blk_bytes.extend([0] * (expected_blocks - len(blk_bytes)))
-        elif len(blk_bytes) > expected_blocks:
-            # Truncate if needed
-            blk_bytes = blk_bytes[:expected_blocks]
-
-        # Process each block in the map
-        for y in range(height):
-            for x in range(width):
-                # Get the block index from the map data
-                block_pos = y * width + x
-                if block_pos < len(blk_bytes):
-                    block_index = blk_bytes[block_pos]
-
-                    # Insert into tiles_raw table
-                    cursor.execute(
-                        """
-                        INSERT INTO tiles_raw (map_id, x, y, block_index, tileset_id, is_overworld)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            map_id,
-                            x,
-                            y,
-                            block_index,
-                            tileset_id,
-                            1 if is_overworld else 0,
-                        ),
-                    )
-                    tiles_raw_count += 1
-
-                    # Commit every 1000 inserts to avoid transaction getting too large
-                    if tiles_raw_count % 1000 == 0:
-                        db_conn.commit()
-                        print(f"Inserted {tiles_raw_count} raw tiles so far...")
+        blk_bytes = blk_bytes[:expected_blocks].ljust(expected_blocks, b"\x00")
+
+        # Insert every block of the map into the tiles_raw table at once
+        tiles_raw_rows = [
+            (
+                map_id,
+                x,
+                y,
+                blk_bytes[y * width + x],
+                tileset_id,
+                1 if is_overworld else 0,
+            )
+            for y in range(height)
+            for x in range(width)
+        ]
+        cursor.executemany(
+            """
+            INSERT INTO tiles_raw (map_id, x, y, block_index, tileset_id, is_overworld)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            tiles_raw_rows,
+        )
+        tiles_raw_count += len(tiles_raw_rows)
 
     db_conn.commit()
     print(f"Inserted {tiles_raw_count} raw tiles into tiles_raw table")
@@ -1002,6 +992,7 @@ def main():
     )
 
     db_conn.commit()
+    finish_bulk_load(cursor)
     db_conn.close()
 
     print("Map data exported to pokemon.db successfully!")
@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
+import functools
 import os
 import re
 import sqlite3
+import sys
 from pathlib import Path
 
+# Add the root directory to the Python path to allow imports from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.sqlite_utils import configure_bulk_load, finish_bulk_load
+
 # Constants
 # Get the project root directory (parent of the script's directory)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -17,12 +23,39 @@ OBJECT_TYPE_BG = "sign"
 OBJECT_TYPE_OBJECT = "npc"
 OBJECT_TYPE_ITEM = "item"
 
+# Regex pattern for parsing map object files in a single pass; each match is
+# a section header, a bg event or an object event, told apart by lastgroup
+MAP_OBJECT_PATTERN = re.compile(
+    r"(?P<section>def_bg_events|def_object_events|def_warps_to)"
+    r"|(?P<bg_event>bg_event\s+(?P<bg_x>\d+),\s+(?P<bg_y>\d+),\s+(?P<bg_text>\w+))"
+    r"|(?P<object_event>object_event\s+(?P<x>\d+),\s+(?P<y>\d+),\s+(?P<sprite>\w+),"
+    r"\s+(?P<action_type>\w+),\s+(?P<action_direction>\w+),\s+(?P<text>\w+)"
+    r"(?:,\s+(?P<item_or_trainer>\w+)(?:,\s+(?P<trainer_level>\w+))?)?)"
+)
+ITEM_SPRITE_NUMBER_PATTERN = re.compile(r"ITEM_(\d+)")
+
+# Sprite name keywords that mark an object event as an item
+ITEM_SPRITE_KEYWORDS = ("ITEM", "BALL", "POTION", "FOSSIL")
+
+# Regex patterns for splitting CamelCase names into words
+CAMEL_WORD_PATTERN = re.compile("(.)([A-Z][a-z]+)")
+CAMEL_BOUNDARY_PATTERN = re.compile("([a-z0-9])([A-Z])")
+
 
 def create_database():
     """Create SQLite database and objects table"""
-    conn = sqlite3.connect(DB_PATH)
+    # Use autocommit mode so main() controls the load transaction with
+    # explicit BEGIN/COMMIT
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
     cursor = conn.cursor()
 
+    # Tune SQLite for bulk loading
+    configure_bulk_load(cursor)
+
+    # The map_id and item_id foreign keys document the references for
+    # queries; they are not checked row by row while loading
+    cursor.execute("PRAGMA foreign_keys=OFF")
+
     # Drop existing objects table if it exists
     cursor.execute("DROP TABLE IF EXISTS objects")
 
@@ -55,39 +88,40 @@ def create_database():
 
 
 def get_all_maps(cursor):
-    """Get all maps from the database"""
-    cursor.execute("SELECT id, name FROM maps")
-    return {name: id for id, name in cursor.fetchall()}
+    """Get all maps from the database as a dict of name -> id
+
+    Also returns the same mapping keyed by lowercase name. For duplicate
+    names the map with the lowest ID wins, like the first row of a lookup query.
+    """
+    cursor.execute("SELECT id, name FROM maps ORDER BY id")
+    maps = {}
+    maps_by_lower_name = {}
+    for id, name in cursor.fetchall():
+        maps.setdefault(name, id)
+        maps_by_lower_name.setdefault(name.lower(), id)
+    return maps, maps_by_lower_name
 
 
 def convert_camel_to_upper_underscore(name):
     """Convert CamelCase to UPPER_CASE_WITH_UNDERSCORES"""
-    s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
-    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).upper()
+    s1 = CAMEL_WORD_PATTERN.sub(r"\1_\2", name)
+    return CAMEL_BOUNDARY_PATTERN.sub(r"\1_\2", s1).upper()
 
 
-def get_map_id_for_map(map_name, cursor):
-    """Get map ID for a map from the maps table"""
+def get_map_id_for_map(map_name, maps, maps_by_lower_name):
+    """Get map ID for a map from the maps loaded by get_all_maps"""
     # Try exact match first
-    cursor.execute("SELECT id FROM maps WHERE name = ?", (map_name,))
-    result = cursor.fetchone()
-    if result:
-        return result[0]
+    if map_name in maps:
+        return maps[map_name]
 
     # Try case-insensitive match
-    cursor.execute("SELECT id FROM maps WHERE LOWER(name) = LOWER(?)", (map_name,))
-    result = cursor.fetchone()
-    if result:
-        return result[0]
+    if map_name.lower() in maps_by_lower_name:
+        return maps_by_lower_name[map_name.lower()]
 
-    # Convert CamelCase to UPPER_CASE_WITH_UNDERSCORES
+    # Convert CamelCase to UPPER_CASE_WITH_UNDERSCORES, only needed when the
+    # cheaper lookups miss
     upper_with_underscores = convert_camel_to_upper_underscore(map_name)
-    cursor.execute("SELECT id FROM maps WHERE name = ?", (upper_with_underscores,))
-    result = cursor.fetchone()
-    if result:
-        return result[0]
-
-    return None
+    return maps.get(upper_with_underscores)
 
 
 def parse_map_name_from_file(file_path):
@@ -97,237 +131,198 @@ def parse_map_name_from_file(file_path):
     return map_name
 
 
-def parse_bg_events(content, map_name):
-    """Parse background events (signs) from the map object file"""
-    signs = []
-
-    # Find the bg events section
-    bg_section_match = re.search(
-        r"def_bg_events(.*?)(?:def_object_events|\Z)", content, re.DOTALL
-    )
-    if not bg_section_match:
-        return signs
+def get_all_items(cursor):
+    """Get all items from the database and create a mapping between item constants and item IDs
 
-    bg_section = bg_section_match.group(1)
+    TM and HM constants such as TM_SUBMISSION are stored under the same
+    short_name that map files reference, so they need no extra aliases.
+    """
+    cursor.execute("SELECT id, short_name FROM items")
+    return {short_name: id for id, short_name in cursor if short_name}
 
-    # Extract individual bg events
-    bg_pattern = r"bg_event\s+(\d+),\s+(\d+),\s+(\w+)"
-    bg_matches = re.finditer(bg_pattern, bg_section)
 
-    for i, match in enumerate(bg_matches):
-        x = int(match.group(1))
-        y = int(match.group(2))
-        text_id = match.group(3)
+@functools.lru_cache(maxsize=None)
+def get_item_sprite_info(sprite):
+    """Check whether a sprite is an item sprite and get its item ID if known
 
-        signs.append(
-            {
-                "name": f"{map_name}_SIGN_{i+1}",
-                "object_type": OBJECT_TYPE_BG,
-                "x": None,  # Global x will be populated later
-                "y": None,  # Global y will be populated later
-                "local_x": x,
-                "local_y": y,
-                "text": text_id,
-                "sprite_name": "SPRITE_SIGN",  # Default sprite for signs
-            }
-        )
+    Maps reuse a small set of sprites, so the result is cached per sprite name.
+    """
+    if not any(keyword in sprite for keyword in ITEM_SPRITE_KEYWORDS):
+        return False, None
 
-    return signs
+    # Try to extract item ID from sprite name if possible
+    item_match = ITEM_SPRITE_NUMBER_PATTERN.search(sprite)
+    return True, int(item_match.group(1)) if item_match else None
 
 
-def get_all_items(cursor):
-    """Get all items from the database and create a mapping between item constants and item IDs"""
-    cursor.execute("SELECT id, name, short_name FROM items")
-    items_by_short_name = {}
+def classify_object(sprite, item_or_trainer, items):
+    """Get the object type and item ID of an object event"""
+    # If it's a Poké Ball sprite, it's likely an item
+    if sprite == "SPRITE_POKE_BALL" and item_or_trainer:
+        # Look up the item ID from the items table using the constant name
+        # If no match, leave item_id as null
+        return OBJECT_TYPE_ITEM, items.get(item_or_trainer)
 
-    for id, name, short_name in cursor.fetchall():
-        if short_name:
-            items_by_short_name[short_name] = id
+    # Check for other item sprites
+    is_item_sprite, item_id = get_item_sprite_info(sprite)
+    if is_item_sprite:
+        return OBJECT_TYPE_ITEM, item_id
 
-    # Add TM and HM mappings
-    cursor.execute(
-        "SELECT id, short_name FROM items WHERE short_name LIKE 'TM%' OR short_name LIKE 'HM%'"
-    )
-    for id, short_name in cursor.fetchall():
-        # Extract the move name from TM_MOVE_NAME format
-        if "_" in short_name:
-            parts = short_name.split("_", 1)
-            if len(parts) > 1:
-                tm_type, move_name = parts
-                # Map both formats: TM_MOVE_NAME and TM_MOVE
-                items_by_short_name[short_name] = id
+    return OBJECT_TYPE_OBJECT, None
 
-                # Also add the TM/HM prefix without the move name
-                # This handles cases where the map file just references "TM_SUBMISSION" etc.
-                if tm_type in ("TM", "HM"):
-                    items_by_short_name[tm_type + "_" + move_name] = id
 
-    return items_by_short_name
+def parse_objects(content, map_name, map_id, items):
+    """Parse signs and object events (NPCs, items) from the map object file
 
+    The file is scanned once. Bg events count from the first def_bg_events up
+    to the next def_object_events, and object events from the first
+    def_object_events up to the next def_warps_to; either section runs to the
+    end of the file if its end header is missing.
 
-def parse_object_events(content, map_name, cursor):
-    """Parse object events (NPCs, items) from the map object file"""
+    Returns rows in the column order of the objects INSERT, signs first.
+    Coordinates are kept as the matched digit strings; the INTEGER affinity of
+    the local_x/local_y columns stores them as integers.
+    """
+    signs = []
     objects = []
 
-    # Get all items from the database
-    items = get_all_items(cursor)
-
-    # Find the object events section
-    object_section_match = re.search(
-        r"def_object_events(.*?)(?:def_warps_to|\Z)", content, re.DOTALL
-    )
-    if not object_section_match:
-        return objects
-
-    object_section = object_section_match.group(1)
-
-    # Extract individual object events
-    object_pattern = r"object_event\s+(\d+),\s+(\d+),\s+(\w+),\s+(\w+),\s+(\w+),\s+(\w+)(?:,\s+(\w+)(?:,\s+(\w+))?)?"
-    object_matches = re.finditer(object_pattern, object_section)
-
-    for i, match in enumerate(object_matches):
-        x = int(match.group(1))
-        y = int(match.group(2))
-        sprite = match.group(3)
-        action_type = match.group(4)
-        action_direction = match.group(5)
-        text_id = match.group(6)
-
-        # Check for additional parameters (item or trainer info)
-        item_or_trainer = (
-            match.group(7) if len(match.groups()) >= 7 and match.group(7) else None
-        )
-        trainer_level = (
-            match.group(8) if len(match.groups()) >= 8 and match.group(8) else None
-        )
-
-        # Determine if this is an item or NPC based on sprite and parameters
-        object_type = OBJECT_TYPE_OBJECT
-        item_id = None
-
-        # If it's a Poké Ball sprite, it's likely an item
-        if sprite == "SPRITE_POKE_BALL" and item_or_trainer:
-            object_type = OBJECT_TYPE_ITEM
-            # Look up the item ID from the items table using the constant name
-            item_id = items.get(item_or_trainer)
-            # If no match, leave item_id as null
-        # Check for other item sprites
-        elif (
-            "ITEM" in sprite
-            or "BALL" in sprite
-            or "POTION" in sprite
-            or "FOSSIL" in sprite
-        ):
-            object_type = OBJECT_TYPE_ITEM
-            # Try to extract item ID from sprite name if possible
-            item_match = re.search(r"ITEM_(\d+)", sprite)
-            if item_match:
-                item_id = int(item_match.group(1))
-
-        objects.append(
-            {
-                "name": f"{map_name}_{'ITEM' if object_type == OBJECT_TYPE_ITEM else 'NPC'}_{i+1}",
-                "object_type": object_type,
-                "x": None,  # Global x will be populated later
-                "y": None,  # Global y will be populated later
-                "local_x": x,
-                "local_y": y,
-                "spriteset_id": None,  # Not implemented yet
-                "sprite_name": sprite,
-                "text": text_id,
-                "action_type": action_type,
-                "action_direction": action_direction,
-                "item_id": item_id,
-            }
-        )
-
-    return objects
-
-
-def process_map_file(file_path, cursor):
+    # None until a section starts, True while it is open, False once it ends
+    in_bg_section = None
+    in_object_section = None
+
+    for match in MAP_OBJECT_PATTERN.finditer(content):
+        kind = match.lastgroup
+        if kind == "bg_event":
+            if not in_bg_section:
+                continue
+
+            signs.append(
+                (
+                    f"{map_name}_SIGN_{len(signs) + 1}",
+                    map_id,
+                    OBJECT_TYPE_BG,
+                    None,  # Global x will be populated later
+                    None,  # Global y will be populated later
+                    match.group("bg_x"),
+                    match.group("bg_y"),
+                    None,  # spriteset_id
+                    "SPRITE_SIGN",  # Default sprite for signs
+                    match.group("bg_text"),
+                    None,  # action_type
+                    None,  # action_direction
+                    None,  # item_id
+                )
+            )
+        elif kind == "object_event":
+            if not in_object_section:
+                continue
+
+            # Determine if this is an item or NPC based on sprite and the
+            # optional item or trainer parameter
+            sprite = match.group("sprite")
+            object_type, item_id = classify_object(
+                sprite, match.group("item_or_trainer"), items
+            )
+
+            objects.append(
+                (
+                    f"{map_name}_{'ITEM' if object_type == OBJECT_TYPE_ITEM else 'NPC'}_{len(objects) + 1}",
+                    map_id,
+                    object_type,
+                    None,  # Global x will be populated later
+                    None,  # Global y will be populated later
+                    match.group("x"),
+                    match.group("y"),
+                    None,  # spriteset_id is not implemented yet
+                    sprite,
+                    match.group("text"),
+                    match.group("action_type"),
+                    match.group("action_direction"),
+                    item_id,
+                )
+            )
+        else:
+            header = match.group("section")
+            if header == "def_bg_events":
+                if in_bg_section is None:
+                    in_bg_section = True
+            elif header == "def_object_events":
+                if in_bg_section:
+                    in_bg_section = False
+                if in_object_section is None:
+                    in_object_section = True
+            elif in_object_section:
+                in_object_section = False
+
+    return signs + objects
+
+
+def process_map_file(file_path, maps, maps_by_lower_name, items):
     """Process a single map object file and extract all objects"""
     map_name = parse_map_name_from_file(file_path)
 
     # Get map ID for this map
-    map_id = get_map_id_for_map(map_name, cursor)
+    map_id = get_map_id_for_map(map_name, maps, maps_by_lower_name)
     if not map_id:
         print(f"Warning: Could not find map ID for map {map_name}")
         return []
 
-    with open(file_path, "r") as f:
-        content = f.read()
-
-    # Parse different types of objects
-    signs = parse_bg_events(content, map_name)
-    objects = parse_object_events(content, map_name, cursor)
+    # Read the whole file as bytes and decode it in one go; the event regexes
+    # treat "\r" as whitespace, so newline translation is not needed
+    with open(file_path, "rb") as f:
+        content = f.read().decode("utf-8")
 
-    # Combine all objects and add map_id
-    all_objects = signs + objects
-    for obj in all_objects:
-        obj["map_id"] = map_id
-
-    return all_objects
+    return parse_objects(content, map_name, map_id, items)
 
 
 def main():
     # Create database
     conn, cursor = create_database()
 
-    # Get all map object files
-    map_files = list(POKEMON_DATA_DIR.glob("*.asm"))
+    # Get all map object files in a single directory scan
+    with os.scandir(POKEMON_DATA_DIR) as entries:
+        map_files = [entry.path for entry in entries if entry.name.endswith(".asm")]
     print(f"Found {len(map_files)} map files")
 
-    # Process each map file
-    all_objects = []
+    # Load the map IDs once for all map files
+    maps, maps_by_lower_name = get_all_maps(cursor)
+
+    # Load the item IDs once for all map files
+    items = get_all_items(cursor)
+
+    # Process each map file, inserting its objects as soon as it is parsed so
+    # only one file's rows are held at a time; all files share one
+    # transaction and one prepared statement
+    insert_sql = """
+    INSERT INTO objects (
+        name, map_id, object_type, x, y, local_x, local_y,
+        spriteset_id, sprite_name, text, action_type, action_direction, item_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    object_count = 0
+    signs_count = 0
     processed_count = 0
 
+    cursor.execute("BEGIN")
     for file_path in map_files:
-        objects = process_map_file(file_path, cursor)
-        all_objects.extend(objects)
+        objects = process_map_file(file_path, maps, maps_by_lower_name, items)
+        cursor.executemany(insert_sql, objects)
+
+        object_count += len(objects)
+        # The object type is the third column of each row
+        signs_count += sum(1 for obj in objects if obj[2] == OBJECT_TYPE_BG)
         processed_count += 1
+    cursor.execute("COMMIT")
 
-    print(f"Processed {processed_count} map files, found {len(all_objects)} objects")
+    print(f"Processed {processed_count} map files, found {object_count} objects")
 
-    # Insert objects into database
-    signs_count = 0
-    sprites_count = 0
-
-    for obj in all_objects:
-        cursor.execute(
-            """
-        INSERT INTO objects (
-            name, map_id, object_type, x, y, local_x, local_y,
-            spriteset_id, sprite_name, text, action_type, action_direction, item_id
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                obj.get("name"),
-                obj.get("map_id"),
-                obj.get("object_type"),
-                obj.get("x"),
-                obj.get("y"),
-                obj.get("local_x"),
-                obj.get("local_y"),
-                obj.get("spriteset_id"),
-                obj.get("sprite_name"),
-                obj.get("text"),
-                obj.get("action_type"),
-                obj.get("action_direction"),
-                obj.get("item_id"),
-            ),
-        )
-
-        if obj.get("object_type") == "sign":
-            signs_count += 1
-        else:
-            sprites_count += 1
+    sprites_count = object_count - signs_count
 
-    # Commit changes and close connection
-    conn.commit()
+    finish_bulk_load(cursor)
     conn.close()
 
     print(
-        f"Successfully exported {len(all_objects)} objects to pokemon.db ({signs_count} signs, {sprites_count} sprites)"
+        f"Successfully exported {object_count} objects to pokemon.db ({signs_count} signs, {sprites_count} sprites)"
     )
     print(
         "Note: Run update_object_coordinates.py to update global coordinates (x, y) based on local coordinates (local_x, local_y)"
@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
+import bisect
+import functools
 import os
 import re
 import sqlite3
+import sys
 from pathlib import Path
 from collections import defaultdict
+from dataclasses import dataclass
+
+# Add the root directory to the Python path to allow imports from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.sqlite_utils import configure_bulk_load, finish_bulk_load
 
 # Constants
 # Get the project root directory (parent of the script's directory)
@@ -30,12 +38,149 @@ CITIES_AND_TOWNS = [
 
 ROUTES = [f"Route{i}" for i in range(1, 26)]
 
+# Cities and towns with the name part used to match their buildings and areas,
+# i.e. without the "City", "Town", "Island" or "Plateau" suffix
+CITY_BASE_NAMES = [
+    (
+        location,
+        location.replace("City", "")
+        .replace("Town", "")
+        .replace("Island", "")
+        .replace("Plateau", ""),
+    )
+    for location in CITIES_AND_TOWNS
+]
+
+# Parent locations of maps that don't follow the naming convention
+PARENT_LOCATION_SPECIAL_CASES = {
+    "OaksLab": "PalletTown",
+    "RedsHouse1F": "PalletTown",
+    "RedsHouse2F": "PalletTown",
+    "BluesHouse": "PalletTown",
+    "Museum1F": "PewterCity",
+    "Museum2F": "PewterCity",
+    "MtMoon1F": "Route4",
+    "MtMoon3F": "Route4",
+    "MtMoonB1F": "Route4",
+    "RockTunnel1F": "Route10",
+    "RockTunnel2F": "Route10",
+    "PowerPlant": "Route10",
+    "SeafoamIslands1F": "Route20",
+    "VictoryRoad1F": "Route23",
+    "VictoryRoad2F": "Route23",
+    "VictoryRoad3F": "Route23",
+    "DiglettsCave": "Route2",
+    "ViridianForest": "Route2",
+    "PokemonTower1F": "LavenderTown",
+    "PokemonTower2F": "LavenderTown",
+    "PokemonTower3F": "LavenderTown",
+    "PokemonTower4F": "LavenderTown",
+    "PokemonTower5F": "LavenderTown",
+    "PokemonTower6F": "LavenderTown",
+    "PokemonTower7F": "LavenderTown",
+    "SilphCo1F": "SaffronCity",
+    "SilphCo2F": "SaffronCity",
+    "SilphCo3F": "SaffronCity",
+    "SilphCo4F": "SaffronCity",
+    "SilphCo5F": "SaffronCity",
+    "SilphCo6F": "SaffronCity",
+    "SilphCo7F": "SaffronCity",
+    "SilphCo8F": "SaffronCity",
+    "SilphCo9F": "SaffronCity",
+    "SilphCo10F": "SaffronCity",
+    "SilphCo11F": "SaffronCity",
+    "PokemonMansion1F": "CinnabarIsland",
+    "PokemonMansion2F": "CinnabarIsland",
+    "PokemonMansion3F": "CinnabarIsland",
+    "PokemonMansionB1F": "CinnabarIsland",
+    "SafariZoneCenter": "FuchsiaCity",
+    "SafariZoneEast": "FuchsiaCity",
+    "SafariZoneNorth": "FuchsiaCity",
+    "SafariZoneWest": "FuchsiaCity",
+    "CeruleanCave1F": "CeruleanCity",
+    "CeruleanCave2F": "CeruleanCity",
+    "CeruleanCaveB1F": "CeruleanCity",
+    "UndergroundPathRoute5": "Route5",
+    "UndergroundPathRoute6": "Route6",
+    "UndergroundPathRoute7": "Route7",
+    "UndergroundPathRoute7Copy": "Route7",
+    "UndergroundPathRoute8": "Route8",
+    "RocketHideoutB1F": "CeladonCity",
+    "RocketHideoutB2F": "CeladonCity",
+    "RocketHideoutB3F": "CeladonCity",
+    "RocketHideoutB4F": "CeladonCity",
+    # Additional special cases for remaining unresolved warps
+    "BikeShop": "CeruleanCity",
+    "MtMoonPokecenter": "Route4",
+    "FightingDojo": "SaffronCity",
+    "PokemonFanClub": "VermilionCity",
+    "SafariZoneGate": "FuchsiaCity",
+    "WardensHouse": "FuchsiaCity",
+    "CopycatsHouse1F": "SaffronCity",
+    "CopycatsHouse2F": "SaffronCity",
+    "GameCorner": "CeladonCity",
+    "BillsHouse": "Route25",
+    "MrFujisHouse": "LavenderTown",
+    "MrPsychicsHouse": "SaffronCity",
+    "GameCornerPrizeRoom": "CeladonCity",
+    "RockTunnelPokecenter": "Route10",
+    "NameRatersHouse": "LavenderTown",
+    "Daycare": "Route5",
+    "Route2TradeHouse": "Route2",
+    "CeruleanTradeHouse": "CeruleanCity",
+    "ViridianNicknameHouse": "ViridianCity",
+    "LavenderCuboneHouse": "LavenderTown",
+    "FuchsiaGoodRodHouse": "FuchsiaCity",
+    "PewterNidoranHouse": "PewterCity",
+    "FuchsiaBillsGrandpasHouse": "FuchsiaCity",
+    "FuchsiaMeetingRoom": "FuchsiaCity",
+    "CeladonChiefHouse": "CeladonCity",
+    "VermilionPidgeyHouse": "VermilionCity",
+    "VermilionOldRodHouse": "VermilionCity",
+    "SaffronPidgeyHouse": "SaffronCity",
+    "ViridianSchoolHouse": "ViridianCity",
+    "Route12SuperRodHouse": "Route12",
+    "Route16FlyHouse": "Route16",
+}
+
+# Regex patterns for parsing map object and header files
+WARP_EVENT_PATTERN = re.compile(r"warp_event\s+(\d+),\s+(\d+),\s+(\w+),\s+(\d+)")
+MAP_HEADER_PATTERN = re.compile(r"map_header\s+\w+,\s+(\w+),")
+
+# Regex patterns for splitting CamelCase names into words
+CAMEL_WORD_PATTERN = re.compile("(.)([A-Z][a-z]+)")
+CAMEL_BOUNDARY_PATTERN = re.compile("([a-z0-9])([A-Z])")
+# Position before every uppercase letter except the first character
+UPPERCASE_SPLIT_PATTERN = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+@dataclass(slots=True)
+class Warp:
+    """A warp event of a map, with its destination once it is resolved"""
+
+    source_map: str
+    source_map_id: int | None
+    source_x: int
+    source_y: int
+    destination_map: str
+    destination_map_id: int | None
+    destination_warp_id: int
+    destination_x: int | None
+    destination_y: int | None
+    warp_index: int
+    is_last_map: int
+
 
 def create_database():
     """Connect to SQLite database and create warps table if it doesn't exist"""
-    conn = sqlite3.connect(DB_PATH)
+    # Use autocommit mode so main() controls the load transaction with
+    # explicit BEGIN/COMMIT
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
     cursor = conn.cursor()
 
+    # Tune SQLite for bulk loading
+    configure_bulk_load(cursor)
+
     # Drop existing warps table if it exists
     cursor.execute("DROP TABLE IF EXISTS warps")
 
@@ -76,21 +221,28 @@ def parse_map_name_from_file(file_path):
     return map_name
 
 
-def extract_map_id_from_header(map_name):
-    """Extract map ID constant from header file"""
-    header_file = Path(f"{MAP_HEADERS_DIR}/{map_name}.asm")
-    if not header_file.exists():
-        return None
+def read_map_header_constants():
+    """Get the map ID constants of all map headers as a dict of map name -> constant
+
+    Warps reference the headers of most maps, so the headers directory is
+    scanned once instead of looking up a header file per map name.
+    """
+    map_constants = {}
+    if not MAP_HEADERS_DIR.is_dir():
+        return map_constants
 
-    with open(header_file, "r") as f:
-        content = f.read()
+    with os.scandir(MAP_HEADERS_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".asm"):
+                continue
 
-    # Look for map_header directive
-    match = re.search(r"map_header\s+\w+,\s+(\w+),", content)
-    if match:
-        return match.group(1)  # Return the constant name, will be converted to ID later
+            # Look for map_header directive
+            match = MAP_HEADER_PATTERN.search(Path(entry.path).read_text())
+            if match:
+                # Store the constant name, will be converted to ID later
+                map_constants[entry.name[: -len(".asm")]] = match.group(1)
 
-    return None
+    return map_constants
 
 
 def get_map_id_from_constant(map_constant, map_to_map_id):
@@ -112,70 +264,57 @@ def get_map_id_from_constant(map_constant, map_to_map_id):
     return None
 
 
-def get_map_id_for_map(map_name, cursor):
-    """Get map ID for a map from the maps table"""
-    # Try exact match first
-    cursor.execute("SELECT id FROM maps WHERE name = ?", (map_name,))
-    result = cursor.fetchone()
-    if result:
-        return result[0]
-
-    # Try case-insensitive match
-    cursor.execute("SELECT id FROM maps WHERE LOWER(name) = LOWER(?)", (map_name,))
-    result = cursor.fetchone()
-    if result:
-        return result[0]
-
-    # Convert CamelCase to UPPER_CASE_WITH_UNDERSCORES
-    upper_with_underscores = convert_camel_to_upper_underscore(map_name)
-    cursor.execute("SELECT id FROM maps WHERE name = ?", (upper_with_underscores,))
-    result = cursor.fetchone()
-    if result:
-        return result[0]
-
-    # Convert UPPER_CASE_WITH_UNDERSCORES to CamelCase
-    if "_" in map_name:
-        camel_case = convert_upper_underscore_to_camel(map_name)
-        cursor.execute("SELECT id FROM maps WHERE name = ?", (camel_case,))
-        result = cursor.fetchone()
-        if result:
-            return result[0]
-
-    return None
-
-
+@functools.lru_cache(maxsize=None)
 def convert_camel_to_upper_underscore(name):
     """Convert CamelCase to UPPER_CASE_WITH_UNDERSCORES"""
-    s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
-    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).upper()
+    s1 = CAMEL_WORD_PATTERN.sub(r"\1_\2", name)
+    return CAMEL_BOUNDARY_PATTERN.sub(r"\1_\2", s1).upper()
 
 
+@functools.lru_cache(maxsize=None)
 def convert_upper_underscore_to_camel(name):
     """Convert UPPER_CASE_WITH_UNDERSCORES to CamelCase"""
     return "".join(word.capitalize() for word in name.lower().split("_"))
 
 
-def parse_warp_events(content, map_name, cursor, map_to_map_id, map_formats):
-    """Parse warp events from the map object file"""
-    warps = []
-
-    # Find the warp events section
-    warp_section_match = re.search(
-        r"def_warp_events(.*?)(?:def_bg_events|def_object_events|\Z)",
-        content,
-        re.DOTALL,
+def read_warp_events(file_path):
+    """Read the warp events of a map object file as (x, y, destination, warp_id)"""
+    content = file_path.read_text()
+
+    # Find the warp events section, which ends at the next bg or object
+    # events section or at the end of the file
+    start = content.find("def_warp_events")
+    if start == -1:
+        return ()
+    start += len("def_warp_events")
+
+    section_ends = [
+        content.find(marker, start) for marker in ("def_bg_events", "def_object_events")
+    ]
+    end = min([pos for pos in section_ends if pos != -1], default=len(content))
+
+    # Extract individual warp events, scanning only the section; findall
+    # returns the captured groups directly without building match objects
+    return tuple(
+        (int(x), int(y), destination, int(warp_id))
+        for x, y, destination, warp_id in WARP_EVENT_PATTERN.findall(
+            content, start, end
+        )
     )
-    if not warp_section_match:
-        return warps
 
-    warp_section = warp_section_match.group(1)
 
-    # Extract individual warp events
-    warp_pattern = r"warp_event\s+(\d+),\s+(\d+),\s+(\w+),\s+(\d+)"
-    warp_matches = re.finditer(warp_pattern, warp_section)
+def parse_warp_events(warp_events, map_name, map_to_map_id, map_constants):
+    """Parse warp events read by read_warp_events from the map object file
+
+    map_constants holds the map ID constants read by read_map_header_constants.
+    """
+    warps = []
+
+    if not warp_events:
+        return warps
 
     # Get map constant from header
-    map_constant = extract_map_id_from_header(map_name)
+    map_constant = map_constants.get(map_name)
     # Convert map constant to integer ID
     map_id = None
     if map_constant:
@@ -185,17 +324,18 @@ def parse_warp_events(content, map_name, cursor, map_to_map_id, map_formats):
     if not map_id:
         map_id = get_map_id_from_mapping(map_name, map_to_map_id)
 
-    for i, match in enumerate(warp_matches):
-        x = int(match.group(1))
-        y = int(match.group(2))
-        destination = match.group(3)
-        destination_warp_id = int(match.group(4))
+    # Warps of a map often share a destination, so each destination's map ID
+    # is looked up once
+    destination_map_ids = {}
 
+    for i, (x, y, destination, destination_warp_id) in enumerate(warp_events):
         # Extract destination map ID if it's not LAST_MAP
         destination_map_id = None
-        if destination != "LAST_MAP":
+        if destination in destination_map_ids:
+            destination_map_id = destination_map_ids[destination]
+        elif destination != "LAST_MAP":
             # Get destination map constant from header
-            destination_constant = extract_map_id_from_header(destination)
+            destination_constant = map_constants.get(destination)
             # Convert destination constant to integer ID
             if destination_constant:
                 destination_map_id = get_map_id_from_constant(
@@ -206,30 +346,43 @@ def parse_warp_events(content, map_name, cursor, map_to_map_id, map_formats):
             if not destination_map_id:
                 destination_map_id = get_map_id_from_mapping(destination, map_to_map_id)
 
+            destination_map_ids[destination] = destination_map_id
+
         warps.append(
-            {
-                "source_map": map_name,
-                "source_map_id": map_id,
-                "source_x": x,
-                "source_y": y,
-                "destination_map": destination,
-                "destination_map_id": destination_map_id,
-                "destination_warp_id": destination_warp_id,
-                "destination_x": None,  # Will be filled in later
-                "destination_y": None,  # Will be filled in later
-                "warp_index": i + 1,  # 1-based index
-                "is_last_map": 1 if destination == "LAST_MAP" else 0,
-            }
+            Warp(
+                source_map=map_name,
+                source_map_id=map_id,
+                source_x=x,
+                source_y=y,
+                destination_map=destination,
+                destination_map_id=destination_map_id,
+                destination_warp_id=destination_warp_id,
+                destination_x=None,  # Will be filled in later
+                destination_y=None,  # Will be filled in later
+                warp_index=i + 1,  # 1-based index
+                is_last_map=1 if destination == "LAST_MAP" else 0,
+            )
         )
 
     return warps
 
 
-def find_incoming_warps(all_warps, target_map):
-    """Find all warps that lead to the target map"""
-    return [warp for warp in all_warps if warp["destination_map"] == target_map]
+def index_incoming_warps(all_warps):
+    """Index the positions of warps in all_warps by their destination map"""
+    incoming_by_destination = defaultdict(list)
+    for position, warp in enumerate(all_warps):
+        incoming_by_destination[warp.destination_map].append(position)
+    return incoming_by_destination
+
 
+def set_warp_destination(warp, position, destination_map, incoming_by_destination):
+    """Change a warp's destination map, keeping the incoming warp index in order"""
+    incoming_by_destination[warp.destination_map].remove(position)
+    bisect.insort(incoming_by_destination[destination_map], position)
+    warp.destination_map = destination_map
 
+
+@functools.lru_cache(maxsize=None)
 def determine_parent_location(map_name):
     """Determine the parent location (city, town, route) for a building or area"""
     # Check if this is already a city, town, or route
@@ -237,14 +390,7 @@ def determine_parent_location(map_name):
         return None
 
     # Try to match with a city or town
-    for location in CITIES_AND_TOWNS:
-        # Remove "City" or "Town" suffix for matching
-        base_name = (
-            location.replace("City", "")
-            .replace("Town", "")
-            .replace("Island", "")
-            .replace("Plateau", "")
-        )
+    for location, base_name in CITY_BASE_NAMES:
         if base_name in map_name:
             return location
 
@@ -254,100 +400,10 @@ def determine_parent_location(map_name):
             return route
 
     # Special cases for maps that don't follow the naming convention
-    special_cases = {
-        "OaksLab": "PalletTown",
-        "RedsHouse1F": "PalletTown",
-        "RedsHouse2F": "PalletTown",
-        "BluesHouse": "PalletTown",
-        "Museum1F": "PewterCity",
-        "Museum2F": "PewterCity",
-        "MtMoon1F": "Route4",
-        "MtMoon3F": "Route4",
-        "MtMoonB1F": "Route4",
-        "RockTunnel1F": "Route10",
-        "RockTunnel2F": "Route10",
-        "PowerPlant": "Route10",
-        "SeafoamIslands1F": "Route20",
-        "VictoryRoad1F": "Route23",
-        "VictoryRoad2F": "Route23",
-        "VictoryRoad3F": "Route23",
-        "DiglettsCave": "Route2",
-        "ViridianForest": "Route2",
-        "PokemonTower1F": "LavenderTown",
-        "PokemonTower2F": "LavenderTown",
-        "PokemonTower3F": "LavenderTown",
-        "PokemonTower4F": "LavenderTown",
-        "PokemonTower5F": "LavenderTown",
-        "PokemonTower6F": "LavenderTown",
-        "PokemonTower7F": "LavenderTown",
-        "SilphCo1F": "SaffronCity",
-        "SilphCo2F": "SaffronCity",
-        "SilphCo3F": "SaffronCity",
-        "SilphCo4F": "SaffronCity",
-        "SilphCo5F": "SaffronCity",
-        "SilphCo6F": "SaffronCity",
-        "SilphCo7F": "SaffronCity",
-        "SilphCo8F": "SaffronCity",
-        "SilphCo9F": "SaffronCity",
-        "SilphCo10F": "SaffronCity",
-        "SilphCo11F": "SaffronCity",
-        "PokemonMansion1F": "CinnabarIsland",
-        "PokemonMansion2F": "CinnabarIsland",
-        "PokemonMansion3F": "CinnabarIsland",
-        "PokemonMansionB1F": "CinnabarIsland",
-        "SafariZoneCenter": "FuchsiaCity",
-        "SafariZoneEast": "FuchsiaCity",
-        "SafariZoneNorth": "FuchsiaCity",
-        "SafariZoneWest": "FuchsiaCity",
-        "CeruleanCave1F": "CeruleanCity",
-        "CeruleanCave2F": "CeruleanCity",
-        "CeruleanCaveB1F": "CeruleanCity",
-        "UndergroundPathRoute5": "Route5",
-        "UndergroundPathRoute6": "Route6",
-        "UndergroundPathRoute7": "Route7",
-        "UndergroundPathRoute7Copy": "Route7",
-        "UndergroundPathRoute8": "Route8",
-        "RocketHideoutB1F": "CeladonCity",
-        "RocketHideoutB2F": "CeladonCity",
-        "RocketHideoutB3F": "CeladonCity",
-        "RocketHideoutB4F": "CeladonCity",
-        # Additional special cases for remaining unresolved warps
-        "BikeShop": "CeruleanCity",
-        "MtMoonPokecenter": "Route4",
-        "FightingDojo": "SaffronCity",
-        "PokemonFanClub": "VermilionCity",
-        "SafariZoneGate": "FuchsiaCity",
-        "WardensHouse": "FuchsiaCity",
-        "CopycatsHouse1F": "SaffronCity",
-        "CopycatsHouse2F": "SaffronCity",
-        "GameCorner": "CeladonCity",
-        "BillsHouse": "Route25",
-        "MrFujisHouse": "LavenderTown",
-        "MrPsychicsHouse": "SaffronCity",
-        "GameCornerPrizeRoom": "CeladonCity",
-        "RockTunnelPokecenter": "Route10",
-        "NameRatersHouse": "LavenderTown",
-        "Daycare": "Route5",
-        "Route2TradeHouse": "Route2",
-        "CeruleanTradeHouse": "CeruleanCity",
-        "ViridianNicknameHouse": "ViridianCity",
-        "LavenderCuboneHouse": "LavenderTown",
-        "FuchsiaGoodRodHouse": "FuchsiaCity",
-        "PewterNidoranHouse": "PewterCity",
-        "FuchsiaBillsGrandpasHouse": "FuchsiaCity",
-        "FuchsiaMeetingRoom": "FuchsiaCity",
-        "CeladonChiefHouse": "CeladonCity",
-        "VermilionPidgeyHouse": "VermilionCity",
-        "VermilionOldRodHouse": "VermilionCity",
-        "SaffronPidgeyHouse": "SaffronCity",
-        "ViridianSchoolHouse": "ViridianCity",
-        "Route12SuperRodHouse": "Route12",
-        "Route16FlyHouse": "Route16",
-    }
-
-    return special_cases.get(map_name)
+    return PARENT_LOCATION_SPECIAL_CASES.get(map_name)
 
 
+@functools.lru_cache(maxsize=None)
 def convert_map_name_to_file_name(map_name):
     """Convert a map name in UPPER_CASE_WITH_UNDERSCORES format to CamelCase file name"""
     if "_" in map_name:
@@ -356,74 +412,39 @@ def convert_map_name_to_file_name(map_name):
     return map_name
 
 
-def find_destination_coordinates(source_map, destination_map, destination_warp_id):
-    """Find the coordinates of a destination warp by directly parsing the destination map file"""
-    # Convert the destination map name to file name format
-    destination_file_name = convert_map_name_to_file_name(destination_map)
-
-    # Construct the path to the destination map file
-    destination_file = POKEMON_DATA_DIR / f"{destination_file_name}.asm"
-
-    # If the file doesn't exist, try the original name
-    if not destination_file.exists():
-        destination_file = POKEMON_DATA_DIR / f"{destination_map}.asm"
-
-    # If the file still doesn't exist, return None
-    if not destination_file.exists():
-        return None, None
-
-    # Read the destination map file
-    with open(destination_file, "r") as f:
-        content = f.read()
-
-    # Find the warp events section
-    warp_section_match = re.search(
-        r"def_warp_events(.*?)(?:def_bg_events|def_object_events|\Z)",
-        content,
-        re.DOTALL,
-    )
-    if not warp_section_match:
-        return None, None
-
-    warp_section = warp_section_match.group(1)
-
-    # Extract individual warp events
-    warp_pattern = r"warp_event\s+(\d+),\s+(\d+),\s+(\w+),\s+(\d+)"
-    warp_matches = list(re.finditer(warp_pattern, warp_section))
-
-    # Find the warp with the matching ID
-    for match in warp_matches:
-        warp_id = int(match.group(4))
-        if warp_id == destination_warp_id:
-            x = int(match.group(1))
-            y = int(match.group(2))
-            return x, y
-
-    return None, None
-
-
-def resolve_last_map_warps(all_warps, cursor, map_to_map_id, map_formats):
+def resolve_last_map_warps(all_warps, map_to_map_id, map_formats):
     """Resolve LAST_MAP references in warps"""
     resolved_warps = []
     resolved_count = 0
 
-    for warp in all_warps:
-        if warp["destination_map"] == "LAST_MAP":
+    # Index the incoming warps of every map once instead of scanning all warps
+    # for each LAST_MAP warp. Resolved warps get a new destination and count
+    # as incoming warps of it for later lookups, so the index is kept up to
+    # date as warps are resolved
+    incoming_by_destination = index_incoming_warps(all_warps)
+
+    for position, warp in enumerate(all_warps):
+        if warp.destination_map == "LAST_MAP":
             # Try to find incoming warps to this map
-            incoming_warps = find_incoming_warps(all_warps, warp["source_map"])
-            if incoming_warps:
+            incoming_positions = incoming_by_destination.get(warp.source_map)
+            if incoming_positions:
                 # Use the first incoming warp as the destination
-                incoming_warp = incoming_warps[0]
-                warp["destination_map"] = incoming_warp["source_map"]
-                warp["destination_map_id"] = incoming_warp["source_map_id"]
-                warp["destination_x"] = incoming_warp["source_x"]
-                warp["destination_y"] = incoming_warp["source_y"]
-                warp["destination_warp_id"] = 0  # Default warp ID
+                incoming_warp = all_warps[incoming_positions[0]]
+                set_warp_destination(
+                    warp,
+                    position,
+                    incoming_warp.source_map,
+                    incoming_by_destination,
+                )
+                warp.destination_map_id = incoming_warp.source_map_id
+                warp.destination_x = incoming_warp.source_x
+                warp.destination_y = incoming_warp.source_y
+                warp.destination_warp_id = 0  # Default warp ID
                 resolved_count += 1
                 resolved_warps.append(warp)
             else:
                 # Try to determine parent location
-                parent_location = determine_parent_location(warp["source_map"])
+                parent_location = determine_parent_location(warp.source_map)
                 if parent_location:
                     # Convert parent location to map name format
                     parent_map = convert_map_name_to_constant(parent_location)
@@ -433,7 +454,9 @@ def resolve_last_map_warps(all_warps, cursor, map_to_map_id, map_formats):
                     parent_file_path = POKEMON_DATA_DIR / f"{parent_file}.asm"
                     if parent_file_path.exists():
                         # Use parent location as destination
-                        warp["destination_map"] = parent_map
+                        set_warp_destination(
+                            warp, position, parent_map, incoming_by_destination
+                        )
 
                         # Get map ID from map_formats or map_to_map_id
                         parent_map_id = map_formats.get(parent_map)
@@ -448,10 +471,10 @@ def resolve_last_map_warps(all_warps, cursor, map_to_map_id, map_formats):
                                     parent_map, map_to_map_id
                                 )
 
-                        warp["destination_map_id"] = parent_map_id
-                        warp["destination_x"] = 0  # Default coordinates
-                        warp["destination_y"] = 0
-                        warp["destination_warp_id"] = 0  # Default warp ID
+                        warp.destination_map_id = parent_map_id
+                        warp.destination_x = 0  # Default coordinates
+                        warp.destination_y = 0
+                        warp.destination_warp_id = 0  # Default warp ID
                         resolved_count += 1
                         resolved_warps.append(warp)
                     else:
@@ -472,22 +495,16 @@ def main():
     # Create database
     conn, cursor = create_database()
 
-    # Get map formats from maps table
+    # Load the maps once and build both lookups from the same rows: the map
+    # formats by exact name, and the map ID mapping with name variations
     map_formats = {}
+    map_to_map_id = {}
     try:
         cursor.execute("SELECT id, name FROM maps")
         for map_id, map_name in cursor.fetchall():
             # Store the UPPER_CASE format
             map_formats[map_name] = map_id
-    except sqlite3.OperationalError:
-        # If maps table doesn't exist, continue without it
-        print("Warning: 'maps' table not found, continuing without map formats")
 
-    # Create a map name to map ID mapping
-    map_to_map_id = {}
-    try:
-        cursor.execute("SELECT id, name FROM maps")
-        for map_id, map_name in cursor.fetchall():
             # Store the original format (ALL_UPPER_CASE_WITH_UNDERSCORES)
             map_to_map_id[map_name] = map_id
 
@@ -505,7 +522,10 @@ def main():
                 map_to_map_id[map_name.replace("f", "F")] = map_id
     except sqlite3.OperationalError:
         # If maps table doesn't exist, continue without it
-        print("Warning: 'maps' table not found, continuing without map ID mapping")
+        print("Warning: 'maps' table not found, continuing without map IDs")
+
+    # Read the map ID constants of all map headers once
+    map_constants = read_map_header_constants()
 
     # Get all map files
     map_files = list(POKEMON_DATA_DIR.glob("*.asm"))
@@ -520,48 +540,34 @@ def main():
         if not map_name:
             continue
 
-        # Get map ID from map name
-        map_id = map_formats.get(map_name)
-        if not map_id:
-            # Try to get map ID from the mapping
-            map_id = get_map_id_from_mapping(map_name, map_to_map_id)
-            if not map_id:
-                # If still not found, try to extract from header
-                map_constant = extract_map_id_from_header(map_name)
-                if map_constant:
-                    map_id = get_map_id_from_constant(map_constant, map_to_map_id)
-
-        # Read the map file
-        with open(file_path, "r") as f:
-            content = f.read()
+        # Read the map file's warp events
+        warp_events = read_warp_events(file_path)
 
         # Parse warp events
-        warps = parse_warp_events(content, map_name, cursor, map_to_map_id, map_formats)
+        warps = parse_warp_events(warp_events, map_name, map_to_map_id, map_constants)
         all_warps.extend(warps)
         processed_count += 1
 
     print(f"Processed {processed_count} map files, found {len(all_warps)} warps")
 
     # Resolve LAST_MAP references
-    resolved_warps = resolve_last_map_warps(
-        all_warps, cursor, map_to_map_id, map_formats
-    )
+    resolved_warps = resolve_last_map_warps(all_warps, map_to_map_id, map_formats)
 
-    # Insert warps into database
-    inserted_count = 0
+    # Build the rows for all warps, then insert them in a single transaction
+    warp_rows = []
     for warp in resolved_warps:
         # Calculate global coordinates for overworld warps
         x = None
         y = None
-        if warp["source_map_id"]:
+        if warp.source_map_id:
             try:
                 # Get the global coordinates of the map (top-left corner)
-                map_x, map_y = get_map_global_coordinates(cursor, warp["source_map_id"])
+                map_x, map_y = get_map_global_coordinates(cursor, warp.source_map_id)
 
                 if map_x is not None and map_y is not None:
                     # Apply the map offset to the warp coordinates
-                    x = map_x + warp["source_x"]
-                    y = map_y + warp["source_y"]
+                    x = map_x + warp.source_x
+                    y = map_y + warp.source_y
 
                     # Ensure x and y are integers, not None
                     if x is not None and y is not None:
@@ -570,91 +576,87 @@ def main():
                 else:
                     # For maps without coordinates, use local coordinates as global coordinates
                     # This ensures at least some coordinates are set
-                    x = warp["source_x"]
-                    y = warp["source_y"]
+                    x = warp.source_x
+                    y = warp.source_y
             except sqlite3.OperationalError as e:
                 # If tiles table doesn't exist, continue without global coordinates
                 # Use local coordinates as fallback
-                x = warp["source_x"]
-                y = warp["source_y"]
+                x = warp.source_x
+                y = warp.source_y
         else:
             # If no map_id, still use local coordinates as global coordinates
-            x = warp["source_x"]
-            y = warp["source_y"]
+            x = warp.source_x
+            y = warp.source_y
 
-        # Use a parameterized query with explicit column names
-        cursor.execute(
-            """
-            INSERT INTO warps (
-                source_map, source_map_id, source_x, source_y,
-                x, y, destination_map, destination_map_id, 
-                destination_x, destination_y, destination_warp_id
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        warp_rows.append(
             (
-                warp["source_map"],
-                warp["source_map_id"],
-                warp["source_x"],
-                warp["source_y"],
+                warp.source_map,
+                warp.source_map_id,
+                warp.source_x,
+                warp.source_y,
                 x,  # Explicitly pass x
                 y,  # Explicitly pass y
-                warp["destination_map"],
-                warp["destination_map_id"],
-                warp["destination_x"],
-                warp["destination_y"],
-                warp["destination_warp_id"],
-            ),
+                warp.destination_map,
+                warp.destination_map_id,
+                warp.destination_x,
+                warp.destination_y,
+                warp.destination_warp_id,
+            )
         )
-        inserted_count += 1
-
-        # Commit more frequently to ensure data is saved
-        if inserted_count % 50 == 0:
-            conn.commit()
-            print(f"Committed {inserted_count} warps so far")
 
-    # Final commit
-    conn.commit()
-    print(f"Final commit: Successfully exported {inserted_count} warps to pokemon.db")
+    # Use a parameterized query with explicit column names
+    cursor.execute("BEGIN")
+    cursor.executemany(
+        """
+        INSERT INTO warps (
+            source_map, source_map_id, source_x, source_y,
+            x, y, destination_map, destination_map_id,
+            destination_x, destination_y, destination_warp_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        warp_rows,
+    )
+    cursor.execute("COMMIT")
+    print(f"Final commit: Successfully exported {len(warp_rows)} warps to pokemon.db")
 
     # Close the database connection
+    finish_bulk_load(cursor)
     conn.close()
 
 
 def get_map_id_from_mapping(map_name, map_to_map_id):
     """Get map ID for a map from the mapping"""
-    # Try exact match
-    if map_name in map_to_map_id:
-        return map_to_map_id[map_name]
+    # Try exact match, then lowercase and uppercase; each variant is probed
+    # once with get, as the mapping holds no None IDs
+    map_id = map_to_map_id.get(map_name)
+    if map_id is not None:
+        return map_id
 
-    # Try lowercase
-    if map_name.lower() in map_to_map_id:
-        return map_to_map_id[map_name.lower()]
+    map_id = map_to_map_id.get(map_name.lower())
+    if map_id is not None:
+        return map_id
 
-    # Try uppercase
-    if map_name.upper() in map_to_map_id:
-        return map_to_map_id[map_name.upper()]
+    map_id = map_to_map_id.get(map_name.upper())
+    if map_id is not None:
+        return map_id
 
     # Try converting CamelCase to UPPER_CASE_WITH_UNDERSCORES
-    upper_with_underscores = convert_camel_to_upper_underscore(map_name)
-    if upper_with_underscores in map_to_map_id:
-        return map_to_map_id[upper_with_underscores]
+    map_id = map_to_map_id.get(convert_camel_to_upper_underscore(map_name))
+    if map_id is not None:
+        return map_id
 
     # Try converting UPPER_CASE_WITH_UNDERSCORES to CamelCase
     if "_" in map_name:
-        camel_case = convert_upper_underscore_to_camel(map_name)
-        if camel_case in map_to_map_id:
-            return map_to_map_id[camel_case]
+        return map_to_map_id.get(convert_upper_underscore_to_camel(map_name))
 
     return None
 
 
+@functools.lru_cache(maxsize=None)
 def convert_map_name_to_constant(map_name):
     """Convert a map name in CamelCase format to UPPER_CASE_WITH_UNDERSCORES constant"""
     # Add underscore before each uppercase letter except the first one
-    constant = "".join(
-        ["_" + c if c.isupper() and i > 0 else c for i, c in enumerate(map_name)]
-    )
-    return constant.upper()
+    return UPPERCASE_SPLIT_PATTERN.sub("_", map_name).upper()
 
 
 def get_map_global_coordinates(cursor, map_id):
@@ -0,0 +1,31 @@
+"""
+Utility module for SQLite settings shared by the export scripts.
+"""
+
+
+def configure_bulk_load(cursor):
+    """Tune a connection for bulk loading tables into the database
+
+    WAL journaling lets other connections read (such as the tile PNG writer of
+    create_zones_and_tiles.py) while a load transaction is open. The journal
+    mode is stored in the database file, so call finish_bulk_load before
+    closing the connection.
+
+    synchronous=OFF skips fsyncs on this connection. A crash during the load
+    can corrupt the whole database file, including tables written by earlier
+    export steps; the exports then have to be rerun from the start.
+    """
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-262144")
+
+
+def finish_bulk_load(cursor):
+    """Switch the database back to the default rollback journal
+
+    Keeps pokemon.db readable by loaders without WAL support (such as sql.js)
+    and by read-only deployments. Needs the other connections to the database
+    to be closed.
+    """
+    cursor.execute("PRAGMA journal_mode=DELETE")